@@ -0,0 +1,181 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from stream_cipher import StreamCipher
+
+
+def _process_file(
+		input_file: str,
+		output_file: str,
+		password: str,
+		key: bytes,
+		hash_algorithm: str,
+		generator_type: str,
+		chunk_size: int,
+		relative_path: str
+) -> dict:
+	start = time.perf_counter()
+	record = {
+		'path': input_file,
+		'output': output_file,
+		'size': os.path.getsize(input_file),
+	}
+
+	try:
+		StreamCipher()._encrypt_decrypt_file_with_key(
+			input_file, output_file, password, key, hash_algorithm, generator_type, chunk_size,
+			file_nonce(relative_path)
+		)
+		record['status'] = 'ok'
+	except Exception as e:
+		record['status'] = 'error'
+		record['error'] = str(e)
+
+	record['seconds'] = time.perf_counter() - start
+	return record
+
+
+def file_nonce(relative_path: str) -> bytes:
+	"""
+	Нонс файла - SHA-256 от его пути относительно корня дерева.
+
+	Нонс добавляется к зерну генератора, поэтому файлы дерева шифруются
+	разными ключевыми потоками, хотя ключ выводится из пароля один раз.
+	Путь не зависит от направления, поэтому расшифрование того же дерева
+	получает те же нонсы.
+	"""
+	return hashlib.sha256(relative_path.replace(os.sep, '/').encode('utf-8')).digest()
+
+
+def _collect_files(source_dir: str, target_dir: str, manifest_path: str) -> list[tuple[str, int]]:
+	files = []
+	target = os.path.abspath(target_dir)
+	manifest = os.path.abspath(manifest_path)
+
+	for root, dirs, names in os.walk(source_dir):
+		# Каталог результатов и манифест внутри исходного каталога не обрабатываются.
+		dirs[:] = [name for name in dirs if os.path.abspath(os.path.join(root, name)) != target]
+		for name in names:
+			path = os.path.join(root, name)
+			if os.path.isfile(path) and os.path.abspath(path) != manifest:
+				files.append((path, os.path.getsize(path)))
+
+	return files
+
+
+def encrypt_decrypt_directory(
+		source_dir: str,
+		target_dir: str,
+		password: str,
+		hash_algorithm: str = 'ready',
+		generator_type: str = 'yarrow160',
+		workers: int = None,
+		chunk_size: int = 1 << 20,
+		manifest_path: str = None
+) -> dict:
+	"""
+	Шифрует (расшифровывает) все файлы дерева каталогов в пуле процессов.
+
+	Ключ выводится из пароля один раз и передаётся процессам, а не
+	вычисляется для каждого файла. Ключевые потоки файлов различаются
+	нонсом от относительного пути (file_nonce), поэтому файл расшифровывается
+	только под тем же относительным путём. Повторное шифрование изменённого
+	файла под тем же путём с тем же паролем использует тот же ключевой поток.
+	Файлы отправляются в пул по убыванию размера, чтобы крупные файлы не
+	оказались в конце очереди. Структура каталогов повторяется в target_dir.
+	Каталог результатов не может совпадать с исходным.
+
+	Args:
+		source_dir: исходный каталог
+		target_dir: каталог результатов
+		password: пароль
+		hash_algorithm: алгоритм хеширования пароля
+		generator_type: тип генератора ключевого потока
+		workers: количество процессов (по умолчанию - число процессоров)
+		chunk_size: размер фрагмента при обработке файла
+		manifest_path: путь к манифесту (по умолчанию <target_dir>.manifest.json рядом с каталогом,
+			чтобы манифест не попал в обрабатываемое дерево при расшифровании)
+
+	Returns:
+		dict: манифест с состоянием и временем обработки каждого файла
+	"""
+	if os.path.realpath(source_dir) == os.path.realpath(target_dir):
+		raise ValueError("Каталог результатов совпадает с исходным каталогом")
+
+	started = time.time()
+	start = time.perf_counter()
+	cipher = StreamCipher()
+	key = cipher._generate_key_from_password(password, hash_algorithm)
+	manifest_path = manifest_path or os.path.normpath(target_dir) + '.manifest.json'
+
+	files = sorted(_collect_files(source_dir, target_dir, manifest_path), key=lambda item: item[1], reverse=True)
+	outputs = {}
+	for path, _ in files:
+		output = os.path.join(target_dir, os.path.relpath(path, source_dir))
+		os.makedirs(os.path.dirname(output), exist_ok=True)
+		outputs[path] = output
+
+	records = []
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [
+			executor.submit(
+				_process_file, path, outputs[path], password, key, hash_algorithm, generator_type, chunk_size,
+				os.path.relpath(path, source_dir)
+			)
+			for path, _ in files
+		]
+		for future in as_completed(futures):
+			records.append(future.result())
+
+	records.sort(key=lambda record: record['path'])
+	manifest = {
+		'source': os.path.abspath(source_dir),
+		'target': os.path.abspath(target_dir),
+		'hash_algorithm': hash_algorithm,
+		'generator_type': generator_type,
+		'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+		'seconds': time.perf_counter() - start,
+		'files_total': len(records),
+		'files_ok': sum(record['status'] == 'ok' for record in records),
+		'files_failed': sum(record['status'] != 'ok' for record in records),
+		'bytes': sum(record['size'] for record in records),
+		'files': records,
+	}
+
+	os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+	with open(manifest_path, 'w', encoding='utf-8') as f:
+		json.dump(manifest, f, indent=4, ensure_ascii=False)
+
+	return manifest
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Пакетное шифрование каталога")
+	parser.add_argument('source_dir')
+	parser.add_argument('target_dir')
+	parser.add_argument('--password', required=True)
+	parser.add_argument('--hash-algorithm', choices=['ready', 'ma_prime', 'gost'], default='ready')
+	parser.add_argument(
+		'--generator',
+		choices=['quadratic', 'yarrow160', 'aes-ctr', 'lfsr', 'geffe', 'shrinking'],
+		default='yarrow160'
+	)
+	parser.add_argument('--workers', type=int, default=None)
+	parser.add_argument('--manifest', default=None)
+	args = parser.parse_args()
+
+	manifest = encrypt_decrypt_directory(
+		args.source_dir, args.target_dir, args.password, args.hash_algorithm, args.generator,
+		args.workers, manifest_path=args.manifest
+	)
+	print(
+		f"Обработано файлов: {manifest['files_ok']} из {manifest['files_total']}, "
+		f"{manifest['bytes']} байт за {manifest['seconds']:.2f} с"
+	)
+
+
+if __name__ == "__main__":
+	main()
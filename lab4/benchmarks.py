@@ -0,0 +1,206 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+from generator import Generator
+
+
+SEED = b'benchmark-seed'
+
+GENERATORS = {
+	'quadratic': lambda: Generator.QuadraticCongruential(int.from_bytes(SEED[:4], 'big')),
+	'bbs': lambda: Generator.BlumBlumShub(int.from_bytes(SEED[:4], 'big')),
+	'yarrow160': lambda: Generator.Yarrow160(SEED),
+	'aes-ctr': lambda: Generator.AESCounter(SEED),
+	'lfsr': lambda: Generator.LFSR(SEED),
+	'geffe': lambda: Generator.Geffe(SEED),
+	'shrinking': lambda: Generator.Shrinking(SEED),
+}
+
+MODES = ('bits', 'bytes')
+
+DEFAULT_SIZES = (1024, 16 * 1024, 256 * 1024)
+
+
+def _produce(gen, mode: str, size: int) -> None:
+	if mode == 'bits':
+		gen.generate_bits(8 * size)
+	else:
+		gen.generate_bytes(size)
+
+
+def _best_time(fn: Callable[[], None], repeat: int) -> float:
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		best = min(best, time.perf_counter() - start)
+
+	return best
+
+
+def measure_setup(name: str, repeat: int) -> dict:
+	"""
+	Измеряет стоимость создания генератора.
+
+	Для BBS отдельно измеряется генерация простых чисел, т.е. та часть
+	инициализации, которая не зависит от длины последовательности.
+
+	Returns:
+		dict: время создания (лучшее из repeat запусков) в секундах
+	"""
+	result = {'setup_seconds': _best_time(GENERATORS[name], repeat)}
+
+	if name == 'bbs':
+		result['prime_generation_seconds'] = _best_time(
+			lambda: Generator.BlumBlumShub.generate_prime(160), repeat
+		)
+
+	return result
+
+
+def measure_run(name: str, mode: str, size: int, repeat: int) -> dict:
+	"""
+	Измеряет установившуюся скорость генерации и пиковую память.
+
+	Время измеряется на уже созданном генераторе, поэтому стоимость
+	инициализации в него не входит. Память измеряется отдельным запуском
+	под tracemalloc, чтобы трассировка не искажала время.
+
+	Args:
+		name: тип генератора
+		mode: режим вывода ('bits' или 'bytes')
+		size: объём вывода в байтах
+		repeat: количество повторов
+
+	Returns:
+		dict: время, скорость (бит/с) и пиковая память (байт)
+	"""
+	generators = [GENERATORS[name]() for _ in range(repeat)]
+	seconds = _best_time(lambda: _produce(generators.pop(), mode, size), repeat)
+
+	gen = GENERATORS[name]()
+	tracemalloc.start()
+	_produce(gen, mode, size)
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	return {
+		'generator': name,
+		'mode': mode,
+		'size_bytes': size,
+		'seconds': seconds,
+		'bits_per_second': 8 * size / seconds if seconds > 0 else None,
+		'peak_memory_bytes': peak,
+	}
+
+
+def run_benchmarks(
+		generators: list[str],
+		sizes: list[int],
+		modes: list[str] = MODES,
+		repeat: int = 3,
+		max_seconds: float = 5.0
+) -> dict:
+	"""
+	Запускает набор измерений для всех генераторов, режимов и размеров.
+
+	Если один запуск генератора занял больше max_seconds, большие размеры
+	для него пропускаются.
+
+	Returns:
+		dict: результаты, пригодные для сохранения в JSON
+	"""
+	results = {
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'setup': {},
+		'runs': [],
+	}
+
+	for name in generators:
+		results['setup'][name] = measure_setup(name, repeat)
+
+		for mode in modes:
+			for size in sorted(sizes):
+				run = measure_run(name, mode, size, repeat)
+				results['runs'].append(run)
+				print(
+					f"{name:10} {mode:5} {size:>9} B  "
+					f"{run['bits_per_second'] / 1e6:10.3f} Мбит/с  "
+					f"{run['peak_memory_bytes'] / 1024:10.1f} КБ"
+				)
+				if run['seconds'] > max_seconds:
+					break
+
+	return results
+
+
+def find_regressions(current: dict, baseline: dict, tolerance: float) -> list[str]:
+	"""
+	Сравнивает скорость с базовыми результатами.
+
+	Args:
+		current: текущие результаты
+		baseline: ранее сохранённые результаты
+		tolerance: допустимое относительное падение скорости (0.2 = 20%)
+
+	Returns:
+		list[str]: описания замедлившихся измерений
+	"""
+	def key(run: dict) -> tuple:
+		return run['generator'], run['mode'], run['size_bytes']
+
+	previous = {key(run): run for run in baseline.get('runs', [])}
+	regressions = []
+
+	for run in current['runs']:
+		old = previous.get(key(run))
+		if old is None or not old['bits_per_second'] or not run['bits_per_second']:
+			continue
+
+		ratio = run['bits_per_second'] / old['bits_per_second']
+		if ratio < 1 - tolerance:
+			regressions.append(
+				f"{run['generator']} {run['mode']} {run['size_bytes']} B: "
+				f"{ratio:.2f}x от базового значения"
+			)
+
+	return regressions
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description="Измерение производительности генераторов ПСП")
+	parser.add_argument('--generators', nargs='+', choices=list(GENERATORS), default=list(GENERATORS))
+	parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+	parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES))
+	parser.add_argument('--repeat', type=int, default=3)
+	parser.add_argument('--max-seconds', type=float, default=5.0)
+	parser.add_argument('--output', default='benchmark_results.json')
+	parser.add_argument('--baseline', default=None, help="JSON с предыдущими результатами")
+	parser.add_argument('--tolerance', type=float, default=0.2)
+	args = parser.parse_args()
+
+	results = run_benchmarks(args.generators, args.sizes, args.modes, args.repeat, args.max_seconds)
+
+	with open(args.output, 'w', encoding='utf-8') as f:
+		json.dump(results, f, indent=4)
+
+	if args.baseline is not None:
+		with open(args.baseline, 'r', encoding='utf-8') as f:
+			baseline = json.load(f)
+
+		regressions = find_regressions(results, baseline, args.tolerance)
+		for line in regressions:
+			print(f"Замедление: {line}")
+		if regressions:
+			return 1
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
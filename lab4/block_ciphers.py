@@ -2,64 +2,51 @@ from block_utils import split_into_blocks, combine_blocks
 from generator import Generator
 import hashlib
 from hash_functions import HashFunctions
+from keystream_cache import KeystreamCache, default_cache
 
 class BlockCipherHandler:
 	def __init__(self, password: str,
-	      	     hash_algorithm: str = 'gost', generator_type: str = 'yarrow160') -> None:
+	      	     hash_algorithm: str = 'gost', generator_type: str = 'yarrow160',
+		     keystream_cache: KeystreamCache = None) -> None:
 		self.password = password
 		self.hash_algorithm = hash_algorithm
 		self.generator_type = generator_type
 		self.generator = Generator()
+		self.keystream_cache = default_cache if keystream_cache is None else keystream_cache
+
+	def _create_generator(self, seed: bytes):
+		if self.generator_type == 'yarrow160':
+			return self.generator.Yarrow160(seed)
+		elif self.generator_type == 'aes-ctr':
+			return self.generator.AESCounter(seed)
+		elif self.generator_type == 'bbs':
+			return self.generator.BlumBlumShub(int.from_bytes(seed[:4], 'big'))
+		else:
+			return self.generator.QuadraticCongruential(int.from_bytes(seed[:4], 'big'))
+
+	def _random_bytes(self, seed: bytes, length: int) -> bytes:
+		cache_key = self.keystream_cache.make_key(seed, self.hash_algorithm, self.generator_type)
+		return self.keystream_cache.get(cache_key, length, lambda: self._create_generator(seed))
 	
 	def _generate_shift_params(self, block_size: int) -> tuple:
 		password_bytes = self.password.encode('utf-8')
 		seed = hashlib.sha256(password_bytes).digest()
 
 		total_bits = block_size * 8
-		bits_needed = 16
-
-		if self.generator_type == 'yarrow160':
-			random_bits = self.generator.yarrow160_generator(bits_needed, seed)
-		elif self.generator_type == 'bbs':
-			random_bits = self.generator.bbs_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
-		else:
-			random_bits = self.generator.quadratic_congruential_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
+		random_bytes = self._random_bytes(seed, 2)
 		
-		shift_byte = 0
-		for i in range(8):
-			shift_byte = (shift_byte << 1) | random_bits[i]
+		shift_byte = random_bytes[0]
 		shift_bits = (shift_byte % (total_bits - 1)) + 1
 
-		direction = 'right' if random_bits[8] else 'left'
+		direction = 'right' if random_bytes[1] >> 7 else 'left'
 
 		return shift_bits, direction
 
 	def _generate_iv(self, block_size: int) -> bytes:
 		password_bytes = self.password.encode('utf-8')
 		seed = hashlib.sha256(password_bytes + b'_IV').digest()
-		bits_needed = block_size * 8
 
-		if self.generator_type == 'yarrow160':
-			random_bits = self.generator.yarrow160_generator(bits_needed, seed)
-		elif self.generator_type == 'bbs':
-			random_bits = self.generator.bbs_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
-		else:
-			random_bits = self.generator.quadratic_congruential_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
-		
-		return self._bits_to_bytes(random_bits)
-	
-	def _bits_to_bytes(self, bits: list) -> bytes:
-		if len(bits) % 8 != 0:
-			raise ValueError("Число битов должно на цело делиться на 8")
-		
-		bytes_list = []
-		for i in range(0, len(bits), 8):
-			byte = 0
-			for j in range(8):
-				byte = (byte << 1) | bits[i + j]
-			bytes_list.append(byte)
-		
-		return bytes(bytes_list)
+		return self._random_bytes(seed, block_size)
 
 
 class Scrambler:
@@ -135,12 +122,24 @@ class DESHandler:
 			self,
 			password: str,
 			hash_algorithm: str = 'gost',
-			generator_type: str = 'yarrow160'
+			generator_type: str = 'yarrow160',
+			keystream_cache: KeystreamCache = None
 	) -> None:
 		self.password = password
 		self.hash_algorithm = hash_algorithm
 		self.generator_type = generator_type
 		self.generator = Generator()
+		self.keystream_cache = default_cache if keystream_cache is None else keystream_cache
+
+	def _create_generator(self, seed: bytes):
+		if self.generator_type == 'yarrow160':
+			return self.generator.Yarrow160(seed)
+		elif self.generator_type == 'aes-ctr':
+			return self.generator.AESCounter(seed)
+		elif self.generator_type == 'bbs':
+			return self.generator.BlumBlumShub(int.from_bytes(seed[:4], 'big'))
+		else:
+			return self.generator.QuadraticCongruential(int.from_bytes(seed[:4], 'big'))
 	
 	def generate_des_keys(self) -> tuple:
 		password_bytes = self.password.encode('utf-8')
@@ -155,16 +154,8 @@ class DESHandler:
 		else:
 			seed = hashlib.sha256(password_bytes).digest()
 		
-		bits_needed = 24 * 8
-
-		if self.generator_type == 'yarrow160':
-			random_bits = self.generator.yarrow160_generator(bits_needed, seed)
-		elif self.generator_type == 'bbs':
-			random_bits = self.generator.bbs_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
-		else:
-			random_bits = self.generator.quadratic_congruential_generator(bits_needed, int.from_bytes(seed[:4], 'big'))
-		
-		key_bytes = self._bits_to_bytes(random_bits)
+		cache_key = self.keystream_cache.make_key(seed, self.hash_algorithm, self.generator_type)
+		key_bytes = self.keystream_cache.get(cache_key, 24, lambda: self._create_generator(seed))
 
 		key1 = key_bytes[:8]
 		key2 = key_bytes[8:16]
@@ -172,20 +163,6 @@ class DESHandler:
 
 		return key1, key2, key3
 
-	def _bits_to_bytes(self, bits: list) -> bytes:
-		if len(bits) % 8 != 0:
-			raise ValueError("Число битов должно на цело делится на 8")
-	
-		bytes_list = []
-		
-		for i in range(0, len(bits), 8):
-			byte = 0
-			for j in range(8):
-				byte = (byte << 1) | bits[i + j]
-			bytes_list.append(byte)
-		
-		return bytes(bytes_list)
-
 
 class DESCipher:
 	IP = [
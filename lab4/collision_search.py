@@ -0,0 +1,253 @@
+import argparse
+import multiprocessing
+import os
+import time
+import numpy as np
+from queue import Empty
+from hash_functions import HashFunctions
+
+
+DEFAULT_PREFIX = b'ma_prime collision '
+POLL_INTERVAL = 0.5
+
+
+def _message(x: int, prefix: bytes) -> bytes:
+	return prefix + x.to_bytes(4, 'big')
+
+
+def _step(x: int, prefix: bytes) -> int:
+	return HashFunctions.ma_prime_hash(_message(x, prefix))
+
+
+def _step_batch(states: np.ndarray, prefix: bytes) -> np.ndarray:
+	matrix = np.empty((len(states), len(prefix) + 4), dtype=np.uint8)
+	matrix[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+	matrix[:, len(prefix):] = states.astype('>u4').view(np.uint8).reshape(-1, 4)
+	return HashFunctions.ma_prime_hash_batch(matrix)
+
+
+def _walker(
+		prefix: bytes,
+		dp_bits: int,
+		walks: int,
+		max_length: int,
+		seed: int,
+		queue,
+		stop
+) -> None:
+	# Процесс ведёт walks блужданий одновременно и отправляет координатору
+	# каждую найденную отмеченную точку вместе с началом и длиной цепочки.
+	# Ошибка отправляется координатору сообщением 'error' вместо 'done'.
+	steps = 0
+	try:
+		rng = np.random.default_rng(seed)
+		mask = np.uint32((1 << dp_bits) - 1)
+		starts = rng.integers(0, 1 << 32, walks, dtype=np.uint32)
+		states = starts.copy()
+		lengths = np.zeros(walks, dtype=np.int64)
+
+		while not stop.is_set():
+			states = _step_batch(states, prefix)
+			lengths += 1
+			steps += walks
+
+			hit = (states & mask) == 0
+			if hit.any():
+				points = list(zip(starts[hit].tolist(), states[hit].tolist(), lengths[hit].tolist()))
+				queue.put(('points', points, steps))
+				steps = 0
+
+			restart = hit | (lengths >= max_length)
+			count = int(np.count_nonzero(restart))
+			if count:
+				fresh = rng.integers(0, 1 << 32, count, dtype=np.uint32)
+				starts[restart] = fresh
+				states[restart] = fresh
+				lengths[restart] = 0
+	except Exception as e:
+		queue.put(('error', f"{type(e).__name__}: {e}", steps))
+		return
+
+	queue.put(('done', [], steps))
+
+
+def _locate(a: int, length_a: int, b: int, length_b: int, prefix: bytes) -> tuple | None:
+	"""
+	Проходит две цепочки, сошедшиеся в одной отмеченной точке, до точки слияния.
+
+	Returns:
+		tuple | None: пара различных x, y с одинаковым f(x) = f(y) и число
+		вычислений хеша; None, если одна цепочка - продолжение другой
+	"""
+	if length_a < length_b:
+		a, length_a, b, length_b = b, length_b, a, length_a
+
+	evaluations = 0
+	for _ in range(length_a - length_b):
+		a = _step(a, prefix)
+		evaluations += 1
+
+	if a == b:
+		return None
+
+	for _ in range(length_b):
+		next_a, next_b = _step(a, prefix), _step(b, prefix)
+		evaluations += 2
+		if next_a == next_b:
+			return a, b, evaluations
+		a, b = next_a, next_b
+
+	return None
+
+
+def find_collision(
+		prefix: bytes = DEFAULT_PREFIX,
+		dp_bits: int = 8,
+		workers: int = None,
+		walks: int = 256,
+		max_table: int = 1 << 20,
+		timeout: float = None
+) -> dict | None:
+	"""
+	Ищет коллизию ma_prime методом ро-Полларда с отмеченными точками.
+
+	Блуждание x -> ma_prime(prefix + x), точка отмечена, если младшие dp_bits
+	битов нулевые. Процессы-исполнители отправляют отмеченные точки в общую
+	таблицу координатора. Совпадение отмеченной точки у двух цепочек с
+	разными началами означает, что цепочки слились; координатор повторно
+	проходит обе цепочки и находит два различных сообщения с одинаковым хешем.
+
+	Ожидаемый объём работы - около sqrt(pi/2 * 2^32) ~ 2^16.3 вычислений
+	плюс около 2^dp_bits шагов на каждое блуждание. Память координатора
+	ограничена max_table записями.
+
+	Args:
+		prefix: общий префикс сообщений
+		dp_bits: число нулевых младших битов отмеченной точки
+		workers: количество процессов (по умолчанию - число процессоров)
+		walks: количество одновременных блужданий в каждом процессе
+		max_table: максимальный размер таблицы отмеченных точек
+		timeout: ограничение времени поиска в секундах
+
+	Returns:
+		dict | None: сообщения, общий хеш, объём работы и скорость; None по таймауту
+	"""
+	if not 0 <= dp_bits < 32:
+		raise ValueError("dp_bits должно быть от 0 до 31")
+
+	workers = workers or os.cpu_count() or 1
+	queue = multiprocessing.Queue()
+	stop = multiprocessing.Event()
+	seeds = np.random.SeedSequence().spawn(workers)
+	processes = [
+		multiprocessing.Process(
+			target=_walker,
+			args=(prefix, dp_bits, walks, 20 << dp_bits, seed.generate_state(1)[0], queue, stop),
+			daemon=True
+		)
+		for seed in seeds
+	]
+
+	table = {}
+	evaluations = 0
+	points = 0
+	result = None
+	start_time = time.perf_counter()
+
+	for process in processes:
+		process.start()
+
+	try:
+		while result is None:
+			remaining = None if timeout is None else timeout - (time.perf_counter() - start_time)
+			if remaining is not None and remaining <= 0:
+				break
+			wait = POLL_INTERVAL if remaining is None else min(remaining, POLL_INTERVAL)
+			try:
+				kind, batch, steps = queue.get(timeout=wait)
+			except Empty:
+				# Процесс, завершившийся без сообщения (например, убитый
+				# системой), больше ничего не пришлёт.
+				for process in processes:
+					if not process.is_alive():
+						raise RuntimeError(f"Процесс поиска завершился с кодом {process.exitcode}")
+				continue
+			evaluations += steps
+			if kind == 'error':
+				raise RuntimeError(f"Ошибка в процессе поиска: {batch}")
+
+			for start, point, length in batch:
+				points += 1
+				previous = table.get(point)
+				if previous is None or previous[0] == start:
+					if len(table) >= max_table:
+						table.clear()
+					table[point] = (start, length)
+					continue
+
+				located = _locate(previous[0], previous[1], start, length, prefix)
+				if located is None:
+					continue
+
+				x, y, extra = located
+				evaluations += extra
+				message_x, message_y = _message(x, prefix), _message(y, prefix)
+				result = {
+					'messages': (message_x, message_y),
+					'digest': HashFunctions.ma_prime_hash(message_x),
+				}
+				break
+	finally:
+		stop.set()
+		done = 0
+		while done < len(processes):
+			try:
+				kind, _, steps = queue.get(timeout=POLL_INTERVAL)
+			except Empty:
+				if not any(process.is_alive() for process in processes):
+					break
+				continue
+			evaluations += steps
+			done += kind in ('done', 'error')
+		for process in processes:
+			process.join()
+
+	if result is None:
+		return None
+
+	seconds = time.perf_counter() - start_time
+	result.update({
+		'evaluations': evaluations,
+		'log2_evaluations': float(np.log2(evaluations)),
+		'distinguished_points': points,
+		'seconds': seconds,
+		'hashes_per_second': evaluations / seconds,
+		'workers': workers,
+	})
+	return result
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Поиск коллизий ma_prime методом ро-Полларда")
+	parser.add_argument('--prefix', default=DEFAULT_PREFIX.decode())
+	parser.add_argument('--dp-bits', type=int, default=8)
+	parser.add_argument('--workers', type=int, default=None)
+	parser.add_argument('--walks', type=int, default=256)
+	parser.add_argument('--timeout', type=float, default=None)
+	args = parser.parse_args()
+
+	result = find_collision(args.prefix.encode(), args.dp_bits, args.workers, args.walks, timeout=args.timeout)
+	if result is None:
+		print("Коллизия не найдена")
+		return
+
+	first, second = result['messages']
+	print(f"Сообщение 1: {first.hex()}")
+	print(f"Сообщение 2: {second.hex()}")
+	print(f"Хеш: {result['digest']:08x}")
+	print(f"Вычислений: {result['evaluations']} (2^{result['log2_evaluations']:.2f})")
+	print(f"Время: {result['seconds']:.2f} с, {result['hashes_per_second']:.0f} хешей/с")
+
+
+if __name__ == "__main__":
+	main()
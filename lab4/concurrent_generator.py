@@ -0,0 +1,157 @@
+import hashlib
+import itertools
+import threading
+from typing import Callable
+from generator import ResumableGenerator, _seed_to_bytes
+
+
+# Обёртки предназначены для случайных значений, которые не нужно
+# воспроизводить: нонсов, векторов инициализации, солей, тестовых данных.
+# Какой фрагмент последовательности получит поток, зависит от порядка
+# обращений потоков, поэтому ключевой поток, который потом нужно
+# расшифровать, через них вырабатывать нельзя. StreamCipher их не
+# использует: параллельные вызовы шифра получают общий прогретый поток через
+# потокобезопасный KeystreamCache, а каждый вызов создаёт свой генератор.
+
+
+def substream_seed(seed, index: int) -> bytes:
+	"""
+	Выводит зерно подпотока с номером index из общего зерна.
+
+	Зерна подпотоков - SHA-256 от зерна и номера, поэтому подпотоки разных
+	номеров независимы и не пересекаются сдвигом одной последовательности.
+
+	Args:
+		seed: общее зерно (int, str, bytes или None)
+		index: номер подпотока
+
+	Returns:
+		bytes: 32 байта зерна подпотока
+	"""
+	return hashlib.sha256(_seed_to_bytes(seed) + index.to_bytes(8, 'big')).digest()
+
+
+class LockedGenerator:
+	"""
+	Потокобезопасная обёртка над одним генератором.
+
+	Все потоки читают одну и ту же последовательность: каждый вызов
+	generate_bytes выдаёт следующий непрерывный фрагмент, фрагменты разных
+	потоков не перекрываются.
+	"""
+	def __init__(self, generator: ResumableGenerator) -> None:
+		self.generator = generator
+		self._lock = threading.Lock()
+
+	def generate_bytes(self, length: int) -> bytes:
+		with self._lock:
+			return self.generator.generate_bytes(length)
+
+	def generate_bits(self, seq_len: int = 10000) -> list[int]:
+		with self._lock:
+			return self.generator.generate_bits(seq_len)
+
+	def tell(self) -> int:
+		with self._lock:
+			return self.generator.tell()
+
+	def seek(self, offset: int) -> None:
+		with self._lock:
+			self.generator.seek(offset)
+
+	def get_state(self) -> dict:
+		with self._lock:
+			return self.generator.get_state()
+
+
+class ThreadLocalGenerator:
+	"""
+	Генератор с отдельным экземпляром для каждого потока.
+
+	Поток при первом обращении получает очередной номер подпотока и создаёт
+	свой генератор от зерна substream_seed(seed, номер). Блокировки при
+	генерации не нужны, а выходы разных потоков не совпадают.
+
+	Номер подпотока зависит от того, в каком порядке потоки впервые
+	обратились к генератору, поэтому выход конкретного потока между
+	запусками не воспроизводится. Воспроизводимый подпоток даёт
+	factory(substream_seed(seed, номер)) с номером, выбранным вызывающим.
+	"""
+	def __init__(self, factory: Callable[[bytes], ResumableGenerator], seed=None) -> None:
+		"""
+		Args:
+			factory: функция, создающая генератор по 32-байтовому зерну подпотока
+			seed: общее зерно
+		"""
+		self.factory = factory
+		self.seed = seed
+		self._local = threading.local()
+		self._indices = itertools.count()
+
+	def _local_generator(self) -> ResumableGenerator:
+		gen = getattr(self._local, 'generator', None)
+		if gen is None:
+			self._local.substream = next(self._indices)
+			gen = self._local.generator = self.factory(substream_seed(self.seed, self._local.substream))
+		return gen
+
+	@property
+	def generator(self) -> ResumableGenerator:
+		return self._local_generator()
+
+	@property
+	def substream(self) -> int:
+		"""
+		Номер подпотока текущего потока.
+		"""
+		self._local_generator()
+		return self._local.substream
+
+	def generate_bytes(self, length: int) -> bytes:
+		return self.generator.generate_bytes(length)
+
+	def generate_bits(self, seq_len: int = 10000) -> list[int]:
+		return self.generator.generate_bits(seq_len)
+
+
+class StripedGenerator:
+	"""
+	Генератор с фиксированным набором экземпляров (полос), каждый под своей блокировкой.
+
+	Подходит, когда потоков много или они короткоживущие: число генераторов
+	ограничено stripes, а потоки распределяются по полосам по кругу. Полоса i
+	выдаёт подпоток substream_seed(seed, i); какая часть подпотока достанется
+	потоку, зависит от порядка обращений, поэтому выход не воспроизводится.
+	"""
+	def __init__(
+			self,
+			factory: Callable[[bytes], ResumableGenerator],
+			seed=None,
+			stripes: int = 8
+	) -> None:
+		"""
+		Args:
+			factory: функция, создающая генератор по 32-байтовому зерну подпотока
+			seed: общее зерно
+			stripes: количество полос
+		"""
+		if stripes < 1:
+			raise ValueError("Количество полос должно быть положительным")
+
+		self.stripes = [
+			LockedGenerator(factory(substream_seed(seed, i))) for i in range(stripes)
+		]
+		self._local = threading.local()
+		self._next = itertools.count()
+
+	def _stripe(self) -> LockedGenerator:
+		index = getattr(self._local, 'index', None)
+		if index is None:
+			index = self._local.index = next(self._next) % len(self.stripes)
+		return self.stripes[index]
+
+	def generate_bytes(self, length: int) -> bytes:
+		return self._stripe().generate_bytes(length)
+
+	def generate_bits(self, seq_len: int = 10000) -> list[int]:
+		return self._stripe().generate_bits(seq_len)
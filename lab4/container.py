@@ -0,0 +1,343 @@
+import hashlib
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from hash_functions import HashFunctions
+from stream_cipher import StreamCipher
+from stream_pipeline import StreamPipeline
+
+
+MAGIC = b'STRMCNT1'
+VERSION = 1
+CHECKSUM_ALGORITHM = 'sha256'
+# Генераторы, переходящие к произвольной позиции за O(1). Остальные при
+# переходе вырабатывают поток почти с той же стоимостью, что и при
+# генерации, поэтому их контейнеры расшифровываются последовательно.
+SEEKABLE_GENERATORS = ('aes-ctr',)
+
+# Формат контейнера:
+#   MAGIC | длина заголовка (4 байта, big-endian) | заголовок (JSON)
+#   | шифртекст по фрагментам chunk_size байт
+#   | таблица фрагментов (JSON) | длина таблицы (8 байт, big-endian) | MAGIC
+# Заголовок описывает параметры шифрования, таблица хранит для каждого
+# фрагмента смещение в контейнере, смещение в ключевом потоке, размер и
+# контрольную сумму шифртекста. Таблица записывается в конце, поэтому
+# контейнер создаётся за один проход.
+# Дайджесты открытого текста в таблице зашифрованы продолжением ключевого
+# потока: байты с позиции plaintext_size накладываются на дайджесты подряд
+# в порядке их перечисления. Дайджесты шифртекста хранятся открыто.
+
+
+def _checksum(data: bytes) -> str:
+	return hashlib.new(CHECKSUM_ALGORITHM, data).hexdigest()
+
+
+def _new_hasher(name: str):
+	# Алгоритмы HashFunctions (ma_prime, gost, md5, sha1, sha256) или любой алгоритм hashlib.
+	try:
+		hasher = HashFunctions.new(name)
+	except ValueError:
+		hasher = hashlib.new(name)
+	if not hasher.digest_size:
+		raise ValueError(f"Алгоритм с переменной длиной дайджеста не поддерживается: {name}")
+	return hasher
+
+
+def _split_keystream(keystream, length: int, tail: bytearray):
+	# Выдаёт первые length байт потока фрагментами, остаток собирает в tail.
+	for chunk in keystream:
+		if len(chunk) > length:
+			tail += chunk[length:]
+			chunk = chunk[:length]
+		if chunk:
+			length -= len(chunk)
+			yield chunk
+
+
+def _mask_digests(digests: dict, keystream: bytes) -> dict:
+	sealed = {}
+	offset = 0
+	for name, digest in digests.items():
+		mask = keystream[offset:offset + len(digest)]
+		sealed[name] = bytes(a ^ b for a, b in zip(digest, mask)).hex()
+		offset += len(digest)
+	return sealed
+
+
+def encrypt_to_container(
+		input_file: str,
+		output_file: str,
+		password: str,
+		hash_algorithm: str = 'ready',
+		generator_type: str = 'yarrow160',
+		chunk_size: int = 1 << 20,
+		cipher: StreamCipher = None,
+		plaintext_digests: tuple[str, ...] = (),
+		ciphertext_digests: tuple[str, ...] = ()
+) -> dict:
+	"""
+	Шифрует файл в самоописывающий контейнер с таблицей контрольных сумм фрагментов.
+
+	Дайджесты открытого текста и шифртекста вычисляются в том же проходе,
+	что и шифрование, и сохраняются в таблице контейнера, поэтому исходный
+	файл читается один раз. Дайджесты открытого текста шифруются, чтобы
+	без пароля по ним нельзя было проверить предполагаемое содержимое.
+
+	Args:
+		plaintext_digests: алгоритмы дайджеста открытого текста
+		ciphertext_digests: алгоритмы дайджеста шифртекста
+
+	Returns:
+		dict: заголовок контейнера
+	"""
+	cipher = cipher or StreamCipher()
+	hashers = {
+		'plaintext': {name: _new_hasher(name) for name in plaintext_digests},
+		'ciphertext': {name: _new_hasher(name) for name in ciphertext_digests},
+	}
+	key = cipher._generate_key_from_password(password, hash_algorithm)
+	# Контейнер расшифровывается генератором, заново созданным из пароля.
+	cipher._create_reproducible_generator(key, generator_type, password)
+	plaintext_size = os.path.getsize(input_file)
+	header = {
+		'version': VERSION,
+		'generator_type': generator_type,
+		'hash_algorithm': hash_algorithm,
+		'chunk_size': chunk_size,
+		'plaintext_size': plaintext_size,
+		'chunk_count': -(-plaintext_size // chunk_size),
+		'checksum_algorithm': CHECKSUM_ALGORITHM,
+	}
+	header_bytes = json.dumps(header).encode('utf-8')
+	data_start = len(MAGIC) + 4 + len(header_bytes)
+
+	chunks = []
+
+	def record_chunk(plain: bytes, encrypted: bytes) -> None:
+		offset = len(chunks) * chunk_size
+		chunks.append({
+			'data_offset': data_start + offset,
+			'keystream_offset': offset,
+			'size': len(encrypted),
+			'checksum': _checksum(encrypted),
+		})
+		for hasher in hashers['plaintext'].values():
+			hasher.update(plain)
+		for hasher in hashers['ciphertext'].values():
+			hasher.update(encrypted)
+
+	# Ключевой поток продолжается за концом данных на длину дайджестов
+	# открытого текста, продолжение собирается в seal_keystream.
+	seal_size = sum(hasher.digest_size for hasher in hashers['plaintext'].values())
+	seal_keystream = bytearray()
+	keystream = _split_keystream(
+		cipher._keystream_chunks(plaintext_size + seal_size, key, generator_type, password, hash_algorithm, chunk_size),
+		plaintext_size,
+		seal_keystream
+	)
+	with open(input_file, 'rb') as fin, open(output_file, 'wb') as fout:
+		fout.write(MAGIC + struct.pack('>I', len(header_bytes)) + header_bytes)
+		StreamPipeline().run(
+			iter(lambda: fin.read(chunk_size), b''), keystream, fout.write, cipher._xor_into, [record_chunk]
+		)
+
+		digests = {
+			'plaintext': _mask_digests(
+				{name: hasher.digest() for name, hasher in hashers['plaintext'].items()}, seal_keystream
+			),
+			'ciphertext': {name: hasher.hexdigest() for name, hasher in hashers['ciphertext'].items()},
+		}
+		trailer = json.dumps({'chunks': chunks, 'digests': digests}).encode('utf-8')
+		fout.write(trailer + struct.pack('>Q', len(trailer)) + MAGIC)
+
+	return header
+
+
+def read_container(path: str) -> tuple[dict, dict]:
+	"""
+	Читает заголовок и таблицу фрагментов контейнера.
+
+	Returns:
+		tuple[dict, dict]: заголовок и таблица ({'chunks': [...], 'digests': {...}})
+	"""
+	with open(path, 'rb') as f:
+		if f.read(len(MAGIC)) != MAGIC:
+			raise ValueError("Файл не является контейнером")
+		header_size, = struct.unpack('>I', f.read(4))
+		header = json.loads(f.read(header_size).decode('utf-8'))
+		if header.get('version') != VERSION:
+			raise ValueError(f"Неподдерживаемая версия контейнера: {header.get('version')}")
+
+		f.seek(-(8 + len(MAGIC)), os.SEEK_END)
+		trailer_size, = struct.unpack('>Q', f.read(8))
+		if f.read(len(MAGIC)) != MAGIC:
+			raise ValueError("Контейнер повреждён: нет таблицы фрагментов")
+		f.seek(-(8 + len(MAGIC) + trailer_size), os.SEEK_END)
+		trailer = json.loads(f.read(trailer_size).decode('utf-8'))
+
+	return header, trailer
+
+
+def _read_chunk(path: str, chunk: dict) -> bytes:
+	with open(path, 'rb') as f:
+		f.seek(chunk['data_offset'])
+		return f.read(chunk['size'])
+
+
+def _chunk_is_valid(path: str, chunk: dict) -> bool:
+	data = _read_chunk(path, chunk)
+	return len(data) == chunk['size'] and _checksum(data) == chunk['checksum']
+
+
+def verify_container(path: str, workers: int = None) -> list[int]:
+	"""
+	Проверяет контрольные суммы всех фрагментов без расшифрования и без пароля.
+
+	Returns:
+		list[int]: номера повреждённых фрагментов
+	"""
+	_, trailer = read_container(path)
+	chunks = trailer['chunks']
+
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		valid = list(executor.map(_chunk_is_valid, [path] * len(chunks), chunks))
+
+	return [index for index, ok in enumerate(valid) if not ok]
+
+
+def _decrypt_range(
+		path: str,
+		output_file: str,
+		password: str,
+		key: bytes,
+		header: dict,
+		chunks: list[dict]
+) -> list[int]:
+	# Исполнитель обрабатывает непрерывный участок фрагментов: генератор
+	# переходит к началу участка один раз и дальше вырабатывает поток подряд.
+	cipher = StreamCipher()
+	generator = cipher._create_keystream_generator(key, header['generator_type'], password)
+	generator.seek(chunks[0]['keystream_offset'])
+	corrupt = []
+
+	with open(path, 'rb') as fin, open(output_file, 'r+b') as fout:
+		for chunk in chunks:
+			fin.seek(chunk['data_offset'])
+			data = bytearray(fin.read(chunk['size']))
+			if len(data) != chunk['size'] or _checksum(data) != chunk['checksum']:
+				corrupt.append(chunk['keystream_offset'] // header['chunk_size'])
+
+			keystream = generator.generate_bytes(chunk['size'])
+			cipher._xor_into(data, keystream[:len(data)])
+			fout.seek(chunk['keystream_offset'])
+			fout.write(data)
+
+	return corrupt
+
+
+def decrypt_container(path: str, output_file: str, password: str, workers: int = None) -> list[int]:
+	"""
+	Расшифровывает контейнер, распределяя участки фрагментов по процессам.
+
+	По процессам распределяются только контейнеры генераторов с быстрым
+	переходом (SEEKABLE_GENERATORS); остальные расшифровываются одним
+	последовательным проходом. Каждый фрагмент перед расшифрованием
+	сверяется с таблицей контрольных сумм.
+
+	Returns:
+		list[int]: номера повреждённых фрагментов (пустой список - контейнер цел)
+	"""
+	header, trailer = read_container(path)
+	chunks = trailer['chunks']
+	cipher = StreamCipher()
+	key = cipher._generate_key_from_password(password, header['hash_algorithm'])
+
+	with open(output_file, 'wb') as f:
+		f.truncate(header['plaintext_size'])
+	if not chunks:
+		return []
+
+	if header['generator_type'] not in SEEKABLE_GENERATORS:
+		workers = 1
+	workers = min(workers or os.cpu_count() or 1, len(chunks))
+	step = -(-len(chunks) // workers)
+	ranges = [chunks[start:start + step] for start in range(0, len(chunks), step)]
+
+	if len(ranges) == 1:
+		return _decrypt_range(path, output_file, password, key, header, ranges[0])
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		results = executor.map(
+			_decrypt_range,
+			[path] * len(ranges),
+			[output_file] * len(ranges),
+			[password] * len(ranges),
+			[key] * len(ranges),
+			[header] * len(ranges),
+			ranges
+		)
+		return [index for corrupt in results for index in corrupt]
+
+
+def read_plaintext_digests(path: str, password: str) -> dict:
+	"""
+	Расшифровывает сохранённые в контейнере дайджесты открытого текста.
+
+	Ключевой поток за концом данных получается переходом генератора к
+	позиции plaintext_size; для генераторов без быстрого перехода это
+	сравнимо по времени с расшифрованием.
+
+	Returns:
+		dict: {алгоритм: шестнадцатеричный дайджест}
+	"""
+	header, trailer = read_container(path)
+	sealed = {name: bytes.fromhex(value) for name, value in trailer.get('digests', {}).get('plaintext', {}).items()}
+	if not sealed:
+		return {}
+
+	cipher = StreamCipher()
+	key = cipher._generate_key_from_password(password, header['hash_algorithm'])
+	generator = cipher._create_keystream_generator(key, header['generator_type'], password)
+	generator.seek(header['plaintext_size'])
+	keystream = generator.generate_bytes(sum(len(value) for value in sealed.values()))
+	return _mask_digests(sealed, keystream)
+
+
+def check_digests(path: str, plaintext_file: str = None, password: str = None) -> dict:
+	"""
+	Сверяет сохранённые в контейнере дайджесты.
+
+	Дайджесты шифртекста проверяются по данным контейнера без пароля,
+	дайджесты открытого текста - по файлу plaintext_file (например, по
+	результату decrypt_container), если указаны файл и пароль.
+
+	Returns:
+		dict: {'plaintext': {алгоритм: bool}, 'ciphertext': {алгоритм: bool}}
+	"""
+	_, trailer = read_container(path)
+	stored = trailer.get('digests', {})
+	result = {'plaintext': {}, 'ciphertext': {}}
+
+	expected = stored.get('ciphertext', {})
+	if expected:
+		hashers = {name: _new_hasher(name) for name in expected}
+		with open(path, 'rb') as f:
+			for chunk in trailer['chunks']:
+				f.seek(chunk['data_offset'])
+				data = f.read(chunk['size'])
+				for hasher in hashers.values():
+					hasher.update(data)
+		result['ciphertext'] = {name: hashers[name].hexdigest() == value for name, value in expected.items()}
+
+	expected = stored.get('plaintext', {})
+	if expected and plaintext_file is not None and password is not None:
+		expected = read_plaintext_digests(path, password)
+		hashers = {name: _new_hasher(name) for name in expected}
+		with open(plaintext_file, 'rb') as f:
+			for data in iter(lambda: f.read(1 << 20), b''):
+				for hasher in hashers.values():
+					hasher.update(data)
+		result['plaintext'] = {name: hashers[name].hexdigest() == value for name, value in expected.items()}
+
+	return result
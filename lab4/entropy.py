@@ -0,0 +1,156 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+
+
+class EntropyAccumulator:
+	"""
+	Накопитель энтропии Yarrow с быстрым и медленным пулами.
+
+	Фоновый поток собирает отсчёты из источников энтропии (os.urandom и джиттер
+	таймера). Отсчёты каждого источника поочерёдно добавляются в быстрый и
+	медленный пулы SHA-1. Когда оценка энтропии пула достигает порога, его
+	дайджест вычисляется заранее и откладывается в очередь готовых значений,
+	а пул начинается заново.
+
+	Генератор при пересеве только забирает готовый дайджест: при частом
+	быстром пересеве - дайджест быстрого пула (fast_reseed_material), при
+	редком медленном - медленного (slow_reseed_material). Поэтому он никогда
+	не ждёт сбора энтропии и не хеширует сырые отсчёты.
+	"""
+	def __init__(
+			self,
+			fast_threshold: int = 100,
+			slow_threshold: int = 160,
+			slow_sources: int = 2,
+			interval: float = 0.01,
+			max_ready: int = 16
+	) -> None:
+		"""
+		Args:
+			fast_threshold: оценка энтропии (бит) для готовности быстрого пула
+			slow_threshold: оценка энтропии (бит) каждого источника для медленного пула
+			slow_sources: сколько источников должны достичь slow_threshold
+			interval: пауза между циклами сбора (секунды)
+			max_ready: максимальное число отложенных дайджестов каждого пула
+		"""
+		self.fast_threshold = fast_threshold
+		self.slow_threshold = slow_threshold
+		self.slow_sources = slow_sources
+		self.interval = interval
+
+		self._lock = threading.Lock()
+		self._fast_pool = hashlib.sha1()
+		self._slow_pool = hashlib.sha1()
+		self._fast_estimate = 0
+		self._slow_estimates = {}
+		self._fast_ready = deque(maxlen=max_ready)
+		self._slow_ready = deque(maxlen=max_ready)
+		self._next_pool = {}
+		self._last_time = time.perf_counter_ns()
+
+		self._stop = threading.Event()
+		self._thread = None
+
+	def add_sample(self, source: str, data: bytes, entropy_bits: int) -> None:
+		"""
+		Добавляет отсчёт в очередной пул (для каждого источника быстрый и медленный чередуются).
+
+		Args:
+			source: имя источника
+			data: данные отсчёта
+			entropy_bits: оценка энтропии отсчёта в битах
+		"""
+		with self._lock:
+			to_fast = self._next_pool.get(source, True)
+			self._next_pool[source] = not to_fast
+
+			if to_fast:
+				self._fast_pool.update(data)
+				self._fast_estimate += entropy_bits
+				if self._fast_estimate >= self.fast_threshold:
+					self._fast_ready.append(self._fast_pool.digest())
+					self._fast_pool = hashlib.sha1(self._fast_ready[-1])
+					self._fast_estimate = 0
+			else:
+				self._slow_pool.update(data)
+				self._slow_estimates[source] = self._slow_estimates.get(source, 0) + entropy_bits
+				ready = [bits for bits in self._slow_estimates.values() if bits >= self.slow_threshold]
+				if len(ready) >= self.slow_sources:
+					self._slow_ready.append(self._slow_pool.digest())
+					self._slow_pool = hashlib.sha1(self._slow_ready[-1])
+					self._slow_estimates = {}
+
+	def collect(self) -> None:
+		"""
+		Выполняет один цикл сбора энтропии из системных источников.
+		"""
+		self.add_sample('urandom', os.urandom(16), 128)
+
+		now = time.perf_counter_ns()
+		jitter = now - self._last_time
+		self._last_time = now
+		self.add_sample('timing', jitter.to_bytes(16, 'big', signed=True), 2)
+
+	def fast_reseed_material(self) -> bytes:
+		"""
+		Возвращает один готовый дайджест быстрого пула для быстрого пересева.
+
+		Пул, не набравший порога энтропии, материала не даёт: если готовых
+		дайджестов нет, возвращается b''.
+
+		Returns:
+			bytes: 20 байт материала для пересева или b''
+		"""
+		with self._lock:
+			if self._fast_ready:
+				return self._fast_ready.popleft()
+			return b''
+
+	def slow_reseed_material(self) -> bytes:
+		"""
+		Возвращает один готовый дайджест медленного пула для медленного пересева.
+
+		Пул, не набравший порога энтропии, материала не даёт: если готовых
+		дайджестов нет, возвращается b''.
+
+		Returns:
+			bytes: 20 байт материала для пересева или b''
+		"""
+		with self._lock:
+			if self._slow_ready:
+				return self._slow_ready.popleft()
+			return b''
+
+	def start(self) -> 'EntropyAccumulator':
+		"""
+		Запускает фоновый поток сбора энтропии.
+		"""
+		if self._thread is None or not self._thread.is_alive():
+			self._stop.clear()
+			self._thread = threading.Thread(target=self._run, name='yarrow-entropy', daemon=True)
+			self._thread.start()
+
+		return self
+
+	def stop(self) -> None:
+		"""
+		Останавливает фоновый поток.
+		"""
+		self._stop.set()
+		if self._thread is not None:
+			self._thread.join()
+			self._thread = None
+
+	def _run(self) -> None:
+		while not self._stop.is_set():
+			self.collect()
+			self._stop.wait(self.interval)
+
+	def __enter__(self) -> 'EntropyAccumulator':
+		return self.start()
+
+	def __exit__(self, exc_type, exc, tb) -> None:
+		self.stop()
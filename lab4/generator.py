@@ -1,10 +1,135 @@
 import random
 import hashlib
+import json
 import time
 import os
 import sympy
 import math
-from Crypto.Cipher import DES
+import struct
+from itertools import chain, compress
+from Crypto.Cipher import AES, DES
+
+
+_BYTE_BITS = [tuple((byte >> (7 - bit)) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def _seed_to_bytes(seed) -> bytes:
+	if seed is None:
+		return b''
+	if isinstance(seed, int):
+		return seed.to_bytes((seed.bit_length() + 7) // 8 or 1, 'big')
+	if isinstance(seed, str):
+		return seed.encode('utf-8')
+	return bytes(seed)
+
+
+class ResumableGenerator:
+	"""
+	Базовый класс генераторов с сохраняемым внутренним состоянием.
+
+	Наследники реализуют generate_bytes, get_state, set_state и tell. Состояние -
+	словарь из JSON-совместимых значений, поэтому генерацию можно прервать,
+	сохранить в файл и продолжить в другом процессе с того же места.
+
+	Состояние также хранит начальную точку последовательности (origin), от
+	которой отсчитываются позиции для seek.
+	"""
+	kind = None
+	_origin = None
+
+	def generate_bytes(self, length: int) -> bytes:
+		raise NotImplementedError
+
+	def generate_bits(self, seq_len: int = 10000) -> list[int]:
+		"""
+		Генерирует псевдослучайную битовую последовательность.
+
+		Args:
+			seq_len: требуемая длина последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		data = self.generate_bytes((seq_len + 7) // 8)
+		bit_seq = list(chain.from_iterable(map(_BYTE_BITS.__getitem__, data)))
+		return bit_seq[:seq_len]
+
+	def get_state(self) -> dict:
+		raise NotImplementedError
+
+	def set_state(self, state: dict) -> None:
+		raise NotImplementedError
+
+	def tell(self) -> int:
+		"""
+		Возвращает текущую позицию в выходной последовательности (в байтах).
+		"""
+		raise NotImplementedError
+
+	def seek(self, offset: int) -> None:
+		"""
+		Переходит к байту с номером offset от начала последовательности.
+
+		Общая реализация перематывает генератор в начало (если нужно) и
+		пропускает байты. Наследники переопределяют её, если генератор
+		допускает более быстрый переход.
+
+		Args:
+			offset: позиция в байтах от начала последовательности
+		"""
+		if offset < 0:
+			raise ValueError("Позиция не может быть отрицательной")
+		
+		if offset < self.tell():
+			self.set_state(self._origin)
+		
+		remaining = offset - self.tell()
+		while remaining > 0:
+			size = min(remaining, 1 << 20)
+			self.generate_bytes(size)
+			remaining -= size
+
+	def _mark_origin(self) -> None:
+		self._origin = None
+		self._origin = self.get_state()
+
+	def iter_chunks(self, chunk_size: int = 65536, total: int = None):
+		"""
+		Итератор по фрагментам выходной последовательности.
+
+		Args:
+			chunk_size: размер фрагмента в байтах
+			total: общее количество байтов (None - бесконечный поток)
+		
+		Yields:
+			bytes: очередной фрагмент длиной не более chunk_size байт
+		"""
+		produced = 0
+		while total is None or produced < total:
+			size = chunk_size if total is None else min(chunk_size, total - produced)
+			yield self.generate_bytes(size)
+			produced += size
+
+	@classmethod
+	def from_state(cls, state: dict) -> 'ResumableGenerator':
+		"""
+		Создаёт генератор из ранее сохранённого состояния без повторной инициализации.
+		"""
+		if state.get('type') != cls.kind:
+			raise ValueError(f"Состояние относится к генератору {state.get('type')}, а не {cls.kind}")
+		
+		gen = cls.__new__(cls)
+		gen.set_state(state)
+		return gen
+
+	def save_state(self, path: str) -> None:
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump(self.get_state(), f, indent=4)
+
+	@classmethod
+	def load_state(cls, path: str) -> 'ResumableGenerator':
+		with open(path, 'r', encoding='utf-8') as f:
+			return cls.from_state(json.load(f))
 
 
 class Generator:
@@ -12,7 +137,9 @@ class Generator:
 	Класс, объединяющий различные генераторы псевдослучайных битовых последовательностей:
 	- Квадратичный конгруэнтный генератор (Quadratic Congruential Generator),
 	- Генератор Блюма-Блюма-Шуба (BBS),
-	- Генератор Yarrow-160.
+	- Генератор Yarrow-160,
+	- Генератор AES-CTR,
+	- Регистры сдвига с линейной обратной связью (LFSR, генераторы Геффе и сжимающий).
 	"""
 	def __init__(self) -> None:
 		"""
@@ -20,108 +147,299 @@ class Generator:
 		"""
 		...
 	
-	def quadratic_congruential_generator(self, seq_len: int = 10000, seed: int = None) -> list[int]:
+	class QuadraticCongruential(ResumableGenerator):
 		"""
 		Квадратичный конгруэнтный генератор псевдослучайной битовой последовательности.
 		
 		Использует рекуррентное соотношение:
 		x_{n+1} = {a * x_n^2 + b * x_n + c} mod m
-
-		Args:
-			seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
-		
-		Returns:
-			List[int]: список битов (0 и 1)
 		"""
 		a = 1664525
 		b = 1
 		c = 1013904223
 		m = 2 ** 32 - 1
+		kind = 'quadratic'
+
+		def __init__(self, seed: int = None) -> None:
+			"""
+			Инициализирует генератор начальным значением x_0.
+
+			Args:
+				seed: начальное значение (по умолчанию 42)
+			"""
+			if seed is None:
+				seed = 42
+			
+			self.x = seed
+			self.step = 0
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {'type': self.kind, 'x': self.x, 'step': self.step, 'origin': self._origin}
+
+		def set_state(self, state: dict) -> None:
+			self.x = state['x']
+			self.step = state.get('step', 0)
+			self._origin = state.get('origin') or state
+
+		def tell(self) -> int:
+			return self.step // 8
+
+		def seek(self, offset: int) -> None:
+			"""
+			Переходит к байту offset, пропуская шаги рекурренты без упаковки битов.
+
+			Квадратичная рекуррента не допускает перехода вперёд за O(1), поэтому
+			стоимость пропорциональна расстоянию до нужной позиции.
+			"""
+			if offset < 0:
+				raise ValueError("Позиция не может быть отрицательной")
+			
+			target = 8 * offset
+			if target < self.step:
+				self.set_state(self._origin)
+			
+			a, b, c, m = self.a, self.b, self.c, self.m
+			x_prev = self.x
+			for _ in range(target - self.step):
+				x_prev = (a * x_prev ** 2 + b * x_prev + c) % m
+			
+			self.x = x_prev
+			self.step = target
 		
-		if seed is None:
-			seed = 42
-		
-		bit_seq = []
-		x_prev = seed
+		def generate_bits(self, seq_len: int = 10000) -> list[int]:
+			"""
+			Генерирует псевдослучайную битовую последовательность.
 
-		for _ in range(seq_len):
-			x_next = (a * x_prev ** 2 + b * x_prev + c) % m
-			bit = x_next & 1
-			bit_seq.append(bit)
-			x_prev = x_next
+			Args:
+				seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
+			
+			Returns:
+				List[int]: список битов (0 и 1)
+			"""
+			a, b, c, m = self.a, self.b, self.c, self.m
+			bit_seq = []
+			x_prev = self.x
+
+			for _ in range(seq_len):
+				x_next = (a * x_prev ** 2 + b * x_prev + c) % m
+				bit = x_next & 1
+				bit_seq.append(bit)
+				x_prev = x_next
+			
+			self.x = x_prev
+			self.step += seq_len
+			return bit_seq
 		
-		return bit_seq
-	
-	def bbs_generator(self, seq_len: int = 10000, seed: int = None) -> list[int]:
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Каждый байт собирается из 8 последовательных битов генератора,
+			старший бит идёт первым.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов
+			"""
+			a, b, c, m = self.a, self.b, self.c, self.m
+			result = bytearray(length)
+			x_prev = self.x
+
+			for i in range(length):
+				byte = 0
+				for _ in range(8):
+					x_prev = (a * x_prev ** 2 + b * x_prev + c) % m
+					byte = (byte << 1) | (x_prev & 1)
+				result[i] = byte
+			
+			self.x = x_prev
+			self.step += 8 * length
+			return bytes(result)
+
+	class BlumBlumShub(ResumableGenerator):
 		"""
 		Генератор Блюма-Блюма-Шуба (Blum-Blum-Shub).
 
 		Алгоритм основан на трудности факторизации больших чисел:
 			x_{n+1} = x_n^2 mod n, где n = p * q (p и q - большие простые числа)
-
-		Args:
-			seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
-		
-		Returns:
-			List[int]: список битов (0 и 1)
 		"""
-		def generate_prime() -> int:
+		kind = 'bbs'
+
+		def __init__(self, seed: int = None, bit_len: int = 160, prime_seed: bytes = None) -> None:
+			"""
+			Генерирует модуль n = p * q и начальное значение x_0.
+
+			Args:
+				seed: начальное значение (по умолчанию выбирается случайно)
+				bit_len: длина простых чисел p и q в битах
+				prime_seed: зерно для детерминированного выбора p и q (по умолчанию
+					простые числа выбираются случайно и последовательность нельзя
+					воспроизвести заново)
+			"""
+			if prime_seed is None:
+				self.p = self.generate_prime(bit_len)
+				self.q = self.generate_prime(bit_len)
+			else:
+				rng = random.Random(prime_seed)
+				self.p = self.derive_prime(rng, bit_len)
+				self.q = self.derive_prime(rng, bit_len)
+				while self.q == self.p:
+					self.q = self.derive_prime(rng, bit_len)
+			self.n = self.p * self.q
+			n = self.n
+
+			if seed is None:
+				while True:
+					seed_val = random.randint(2, n-1)
+					if math.gcd(seed_val, n) == 1:
+						break
+			else:
+				seed_val = seed % (n - 2) + 2
+				while math.gcd(seed_val, n) != 1:
+					seed_val = (seed_val + 1) % (n - 2)
+					if seed_val < 2:
+						seed_val = 2
+			
+			self.x = pow(seed_val, 2, n)
+			self.step = 0
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'p': self.p,
+				'q': self.q,
+				'x': self.x,
+				'step': self.step,
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.p = state['p']
+			self.q = state['q']
+			self.n = self.p * self.q
+			self.x = state['x']
+			self.step = state.get('step', 0)
+			self._origin = state.get('origin') or state
+
+		def tell(self) -> int:
+			return self.step // 8
+
+		def seek(self, offset: int) -> None:
 			"""
-			Функция, генерирующая простое число длинной 160 бит.
+			Переходит к байту offset за O(log offset) операций.
+
+			Так как x_i = x_0^(2^i) mod n, показатель 2^i можно сократить по
+			модулю функции Кармайкла λ(n) = lcm(p - 1, q - 1).
+			"""
+			if offset < 0:
+				raise ValueError("Позиция не может быть отрицательной")
+			
+			self.step = 8 * offset
+			carmichael = math.lcm(self.p - 1, self.q - 1)
+			self.x = pow(self._origin['x'], pow(2, self.step, carmichael), self.n)
+
+		@staticmethod
+		def generate_prime(bit_len: int = 160) -> int:
+			"""
+			Функция, генерирующая простое число длинной bit_len бит.
 
 			С помощью функции randprime из библиотеки sympy генерирует 
-			простое число в диапазаоне от 2^159 до 2^160.
+			простое число в диапазаоне от 2^(bit_len - 1) до 2^bit_len.
 
 			Returns:
 				int: большое простое число, удовлетворяющее условию: `prime ≡ 3 (mod 4)`
 			"""
-			bit_len = 160
 			while True:
 				prime = sympy.randprime(2**(bit_len - 1), 2**bit_len)
 				if prime % 4 == 3:
 					return prime
 		
-		p = generate_prime() 
-		q = generate_prime()
-		n = p * q
-		
-		if seed is None:
+		@staticmethod
+		def derive_prime(rng: random.Random, bit_len: int = 160) -> int:
+			"""
+			Детерминированно выбирает простое число длиной bit_len бит по генератору rng.
+
+			Returns:
+				int: большое простое число, удовлетворяющее условию: `prime ≡ 3 (mod 4)`
+			"""
 			while True:
-				seed_val = random.randint(2, n-1)
-				if math.gcd(seed, n) == 1:
-					break
-		else:
-			seed_val = seed % (n - 2) + 2
-			while math.gcd(seed_val, n) != 1:
-				seed_val = (seed_val + 1) % (n - 2)
-				if seed_val < 2:
-					seed_val = 2
-
-		x_prev = pow(seed_val, 2, n)
-		bit_seq = []
-
-		for _ in range(seq_len):
-			x_next = pow(x_prev, 2, n)
-			bit = x_next & 1
-			bit_seq.append(bit)
-			x_prev = x_next
+				prime = sympy.nextprime(rng.getrandbits(bit_len - 1) | (1 << (bit_len - 1)))
+				while prime % 4 != 3:
+					prime = sympy.nextprime(prime)
+				if prime < 2**bit_len:
+					return prime
 		
-		return bit_seq
+		def generate_bits(self, seq_len: int = 10000) -> list[int]:
+			"""
+			Генерирует псевдослучайную битовую последовательность.
+
+			Args:
+				seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
+			
+			Returns:
+				List[int]: список битов (0 и 1)
+			"""
+			n = self.n
+			x_prev = self.x
+			bit_seq = []
+
+			for _ in range(seq_len):
+				x_next = pow(x_prev, 2, n)
+				bit = x_next & 1
+				bit_seq.append(bit)
+				x_prev = x_next
+			
+			self.x = x_prev
+			self.step += seq_len
+			return bit_seq
+		
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов (старший бит каждого байта идёт первым)
+			"""
+			n = self.n
+			x_prev = self.x
+			result = bytearray(length)
+
+			for i in range(length):
+				byte = 0
+				for _ in range(8):
+					x_prev = x_prev * x_prev % n
+					byte = (byte << 1) | (x_prev & 1)
+				result[i] = byte
+			
+			self.x = x_prev
+			self.step += 8 * length
+			return bytes(result)
 	
-	class Yarrow160:
+	class Yarrow160(ResumableGenerator):
 		"""
 		Реализация криптографического генератора Yarrow-160.
 
 		Генератор основан на идее периодического обновления ключа K и счётчика C
 		с использованием блочного шифра (DES) и хеш-функции (SHA-1)
 		"""
+		kind = 'yarrow160'
+
 		def __init__(
 				self,
 				seed = None,
 				n: int = 64,
 				k: int = 64,
 				Pg: int = 10,
-				Pt: int = 20
+				Pt: int = 20,
+				entropy_source = None,
+				Ps: int = 10
 		) -> None:
 			"""
 			Инициализирует параметры генератора Yarrow-160.
@@ -131,7 +449,14 @@ class Generator:
 				k: рзамер ключа (бит)
 				Pg: порог обновления ключа K
 				Pt: порог обновления ключа и счётчика
+				entropy_source: накопитель энтропии (entropy.EntropyAccumulator);
+					без него последовательность полностью определяется seed
+				Ps: каждый Ps-й пересев на пороге Pt использует медленный пул
+					накопителя, остальные - быстрый
 			"""
+			self.entropy_source = entropy_source
+			self.Ps = Ps
+			self.curPs = Ps
 			self.n = n
 			self.k = k
 			self.Pg = Pg
@@ -141,6 +466,9 @@ class Generator:
 			self.C = 0
 			self.t = 0
 			self.counter = 0
+			self._cipher = None
+			self._cipher_key = None
+			self._pending = b''
 
 			if seed is not None:
 				if isinstance(seed, int):
@@ -158,28 +486,131 @@ class Generator:
 				self.K = hashlib.sha1(seed_bytes).digest()[:8]
 			else:
 				self.K = b'\x01' * 8
+			
+			self.block_index = 0
+			self._checkpoints = {}
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'n': self.n,
+				'k': self.k,
+				'Pg': self.Pg,
+				'Pt': self.Pt,
+				'curPg': self.curPg,
+				'curPt': self.curPt,
+				'C': self.C,
+				't': self.t,
+				'counter': self.counter,
+				'K': self.K.hex(),
+				'pending': self._pending.hex(),
+				'block_index': self.block_index,
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.n = state['n']
+			self.k = state['k']
+			self.Pg = state['Pg']
+			self.Pt = state['Pt']
+			self.curPg = state['curPg']
+			self.curPt = state['curPt']
+			self.C = state['C']
+			self.t = state['t']
+			self.counter = state['counter']
+			self.K = bytes.fromhex(state['K'])
+			self._pending = bytes.fromhex(state['pending'])
+			self.block_index = state.get('block_index', 0)
+			self._origin = state.get('origin') or state
+			self._cipher = None
+			self._cipher_key = None
+			if not hasattr(self, '_checkpoints'):
+				self._checkpoints = {}
+			if not hasattr(self, 'entropy_source'):
+				self.entropy_source = None
+				self.Ps = self.curPs = 10
+
+		def tell(self) -> int:
+			return 8 * self.block_index - len(self._pending)
+
+		def seek(self, offset: int) -> None:
+			"""
+			Переходит к байту offset без шифрования пропускаемых блоков.
+
+			Счётчик C растёт на единицу с каждым блоком, поэтому при переходе
+			выполняются только обновления ключа на порогах Pg и Pt. Каждые
+			checkpoint_interval блоков запоминается состояние генератора (не более
+			max_checkpoints точек, при переполнении интервал удваивается), и
+			повторные переходы начинаются с ближайшей контрольной точки.
+
+			Args:
+				offset: позиция в байтах от начала последовательности
+			"""
+			if offset < 0:
+				raise ValueError("Позиция не может быть отрицательной")
+			if self.entropy_source is not None:
+				raise ValueError("Генератор с внешним источником энтропии не поддерживает переход")
+			
+			target_block, skip = divmod(offset, 8)
+			start = max((index for index in self._checkpoints if index <= target_block), default=None)
+
+			if self.block_index <= target_block and (start is None or start <= self.block_index):
+				self._pending = b''
+			else:
+				self.set_state(self._origin if start is None else self._checkpoints[start])
+			
+			self.skip_blocks(target_block - self.block_index)
+			if skip:
+				self._pending = self.generate_blocks(1)[skip:]
 
 				
-		def entropy_accumulator(self) -> bytes:
+		def entropy_accumulator(self, material: bytes = b'') -> bytes:
 			"""
 			Имитация наколепния энтропии.
 
 			Генерирует псевдослучайные данные на основе системного времени, 
-			PID процесса и случайных байт.
+			PID процесса и случайных байт. К данным добавляется материал
+			пересева из накопителя энтропии (reseed_material), если он передан.
 
 			Returns:
 				bytes: SHA-1 хеш от собранных жнтропийных данных
 			"""
 			self.counter += 1
 			data = self.K + self.C.to_bytes(8, 'big') + self.counter.to_bytes(8, 'big')
-			return hashlib.sha1(data).digest()
+			return hashlib.sha1(data + material).digest()
+
+		def reseed_material(self) -> bytes:
+			"""
+			Забирает из накопителя энтропии один дайджест для очередного пересева.
+
+			Каждый Ps-й пересев медленный и использует медленный пул, остальные
+			быстрые и используют быстрый пул. Без накопителя или если нужный пул
+			ещё не набрал порога энтропии возвращается b'', и пересев выполняется
+			без внешнего материала.
+
+			Returns:
+				bytes: материал пересева
+			"""
+			if self.entropy_source is None:
+				return b''
 
+			self.curPs -= 1
+			if self.curPs == 0:
+				self.curPs = self.Ps
+				return self.entropy_source.slow_reseed_material()
+			return self.entropy_source.fast_reseed_material()
 		
-		def update_key(self) -> None:
+		def update_key(self, material: bytes = None) -> None:
 			"""
 			Обновляет внутренний ключ K и счётчик C на сонове новой энтропии.
+
+			Args:
+				material: материал пересева (по умолчанию забирается reseed_material)
 			"""
-			entropy = self.entropy_accumulator()
+			if material is None:
+				material = self.reseed_material()
+			entropy = self.entropy_accumulator(material)
 			self.K = hashlib.sha1(self.K + entropy).digest()[:8]
 			self.C = (self.C + 1) % (2 ** self.n)
 		
@@ -193,8 +624,39 @@ class Generator:
 			Returns:
 				bytes: зашифрованный блок длиной 8 байт
 			"""
-			cipher = DES.new(self.K, DES.MODE_ECB)
-			return cipher.encrypt(data)
+			return self._get_cipher().encrypt(data)
+
+		def _get_cipher(self):
+			"""
+			Возвращает объект DES-ECB для текущего ключа K.
+
+			Объект создаётся заново только при смене ключа, поэтому между
+			обновлениями ключа все блоки шифруются одним и тем же объектом.
+			"""
+			if self._cipher is None or self._cipher_key != self.K:
+				self._cipher = DES.new(self.K, DES.MODE_ECB)
+				self._cipher_key = self.K
+			return self._cipher
+
+		def encrypt_counter_blocks(self, count: int) -> bytes:
+			"""
+			Шифрует `count` последовательных значений счётчика, начиная с C.
+
+			Все значения счётчика собираются в один буфер и шифруются
+			одним вызовом DES-ECB.
+
+			Args:
+				count: количество блоков
+			
+			Returns:
+				bytes: зашифрованные блоки общей длиной 8 * count байт
+			"""
+			mod = 2 ** self.n
+			if self.C + count <= mod:
+				counters = range(self.C, self.C + count)
+			else:
+				counters = [(self.C + i) % mod for i in range(count)]
+			return self._get_cipher().encrypt(struct.pack(f'>{count}Q', *counters))
 		
 		def H(self, v: bytes, K: bytes) -> bytes:
 			"""
@@ -224,46 +686,510 @@ class Generator:
 			Ci_bytes = Ci.to_bytes(8, "big")
 			return self.encrypt_block(Ci_bytes)
 		
-		def generate_bits(self, seq_len: int = 10000):
+		def _apply_gates(self) -> None:
 			"""
-			Генерирует псевдослучайную битовую последовательность.
+			Обновляет ключ K при достижении порогов Pg и Pt.
+			"""
+			if self.curPg == 0:
+				self.K = self.G(self.C)
+				self.curPg = self.Pg
+			
+			if self.curPt == 0:
+				material = self.reseed_material()
+				v0 = hashlib.sha1(self.entropy_accumulator(material) + self.K).digest()[:8]
+				v = v0
+				for _ in range(2):
+					v = hashlib.sha1(v + v0 + self.K).digest()[:8]
+				self.K = self.H(v, self.K)
+				self.update_key(material)
+				self.curPt = self.Pt
+
+		checkpoint_interval = 1 << 16
+		max_checkpoints = 64
+
+		def _advance(self, run: int) -> None:
+			self.C = (self.C + run) % (2 ** self.n)
+			self.curPg -= run
+			self.curPt -= run
+			
+			previous = self.block_index
+			self.block_index += run
+			if previous // self.checkpoint_interval != self.block_index // self.checkpoint_interval:
+				state = self.get_state()
+				state['pending'] = ''
+				self._checkpoints[self.block_index] = state
+				if len(self._checkpoints) > self.max_checkpoints:
+					self._thin_checkpoints()
+
+		def _thin_checkpoints(self) -> None:
+			# Интервал между контрольными точками удваивается, и из каждого
+			# нового интервала остаётся одна точка, поэтому размер таблицы
+			# ограничен max_checkpoints независимо от длины потока.
+			self.checkpoint_interval *= 2
+			thinned = {}
+			for index in sorted(self._checkpoints):
+				if not thinned or index // self.checkpoint_interval != max(thinned) // self.checkpoint_interval:
+					thinned[index] = self._checkpoints[index]
+			self._checkpoints = thinned
+
+		def skip_blocks(self, num_blocks: int) -> None:
+			"""
+			Пропускает заданное количество блоков, выполняя только обновления ключа.
+
+			Args:
+				num_blocks: количество пропускаемых блоков
+			"""
+			while num_blocks > 0:
+				self._apply_gates()
+
+				run = min(self.curPg, self.curPt, num_blocks)
+				self._advance(run)
+				num_blocks -= run
+
+		def generate_blocks(self, num_blocks: int) -> bytes:
+			"""
+			Генерирует заданное количество 8-байтовых блоков выходной последовательности.
+
+			Между порогами Pg и Pt ключ не меняется, поэтому блоки одного такого
+			отрезка шифруются одним вызовом encrypt_counter_blocks.
 
 			Args:
-				seq_len: требуемая длина последовательности (по умолчанию 10000)
+				num_blocks: количество блоков
 			
 			Returns:
-				List[int]: список битов (0 и 1)
+				bytes: выходная последовательность длиной 8 * num_blocks байт
 			"""
-			bit_seq = []
+			blocks = []
 
-			while len(bit_seq) < seq_len:
-				if self.curPg == 0:
-					self.K = self.G(self.C)
-					self.curPg = self.Pg
-				
-				if self.curPt == 0:
-					v0 = hashlib.sha1(self.entropy_accumulator() + self.K).digest()[:8]
-					v = v0
-					for _ in range(2):
-						v = hashlib.sha1(v + v0 + self.K).digest()[:8]
-					self.K = self.H(v, self.K)
-					self.update_key()
-					self.curPt = self.Pt
-				
-				xi = self.encrypt_block(self.C.to_bytes(8, "big"))
-				self.C = (self.C + 1) % (2 ** self.n)
-				self.curPg -= 1
-				self.curPt -= 1
-
-				for byte in xi:
-					for bit in range(8):
-						bit_seq.append((byte >> (7 - bit)) & 1)
-						if len(bit_seq) >= seq_len:
-							break
-					if len(bit_seq) >= seq_len:
-						break
+			while num_blocks > 0:
+				self._apply_gates()
+
+				run = min(self.curPg, self.curPt, num_blocks)
+				blocks.append(self.encrypt_counter_blocks(run))
+				self._advance(run)
+				num_blocks -= run
 			
-			return bit_seq
+			return b''.join(blocks)
+		
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Неиспользованный остаток последнего блока сохраняется и выдаётся
+			в начале следующего вызова.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов
+			"""
+			data = self._pending
+			if len(data) < length:
+				data += self.generate_blocks((length - len(data) + 7) // 8)
+			
+			self._pending = data[length:]
+			return data[:length]
+	
+	class AESCounter(ResumableGenerator):
+		"""
+		Детерминированный генератор на основе AES-256 в режиме счётчика (CTR).
+
+		Выходная последовательность - результат шифрования значений 128-битного
+		счётчика на ключе, полученном из seed хеш-функцией SHA-256. Шифрование
+		выполняется библиотекой pycryptodome, поэтому генератор на порядки
+		быстрее остальных и может служить эталоном для статистических тестов.
+		"""
+		kind = 'aes-ctr'
+		block_size = 16
+
+		def __init__(self, seed = None) -> None:
+			"""
+			Инициализирует ключ генератора.
+
+			Args:
+				seed: начальное значение (bytes, str или int)
+			"""
+			self.key = hashlib.sha256(_seed_to_bytes(seed)).digest()
+			self.position = 0
+			self._cipher = None
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'key': self.key.hex(),
+				'position': self.position,
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.key = bytes.fromhex(state['key'])
+			self.position = state['position']
+			self._origin = state.get('origin') or state
+			self._cipher = None
+
+		def tell(self) -> int:
+			return self.position
+
+		def seek(self, offset: int) -> None:
+			"""
+			Переходит к байту offset за O(1): счётчик устанавливается в offset // 16.
+			"""
+			if offset < 0:
+				raise ValueError("Позиция не может быть отрицательной")
+			
+			self.position = offset
+			self._cipher = None
+
+		def _get_cipher(self):
+			if self._cipher is None:
+				block, skip = divmod(self.position, self.block_size)
+				self._cipher = AES.new(self.key, AES.MODE_CTR, nonce=b'', initial_value=block)
+				self._cipher.encrypt(bytes(skip))
+			return self._cipher
+
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов
+			"""
+			data = self._get_cipher().encrypt(bytes(length))
+			self.position += length
+			return data
+	
+	class LFSR(ResumableGenerator):
+		"""
+		Регистр сдвига с линейной обратной связью (Linear Feedback Shift Register).
+
+		Последовательность задаётся рекуррентой s_{t+L} = XOR s_{t+k} по всем k из taps,
+		что соответствует примитивному многочлену x^L + сумма x^k над GF(2).
+
+		Состояние хранится одним L-битным целым числом, где старший бит - ближайший
+		выходной бит. Следующие w бит зависят только от текущего состояния, если
+		все отводы удовлетворяют k <= L - w, поэтому за одну операцию над целыми
+		числами вычисляется сразу step_bits = 64 * ((L - max(taps)) // 64) бит.
+		"""
+		kind = 'lfsr'
+		word_bits = 64
+		max_batch_words = 1 << 14
+
+		def __init__(self, seed = None, length: int = 1279, taps: tuple = (216, 0)) -> None:
+			"""
+			Инициализирует регистр.
+
+			Args:
+				seed: начальное значение (bytes, str или int)
+				length: длина регистра L
+				taps: показатели младших членов многочлена обратной связи
+			"""
+			self.length = length
+			self.taps = tuple(taps)
+			self._check_taps()
+			self.state = self.expand_seed(_seed_to_bytes(seed), length)
+			self.word_index = 0
+			self._pending = b''
+			self._mark_origin()
+
+		def _check_taps(self) -> None:
+			if max(self.taps) > self.length - self.word_bits:
+				raise ValueError(
+					f"Для пословного шага отводы должны быть не больше {self.length - self.word_bits}"
+				)
+
+		@staticmethod
+		def expand_seed(seed_bytes: bytes, length: int) -> int:
+			"""
+			Растягивает seed до length бит с помощью SHA-256.
+
+			Returns:
+				int: ненулевое начальное состояние регистра
+			"""
+			material = b''
+			counter = 0
+			while len(material) * 8 < length:
+				material += hashlib.sha256(seed_bytes + counter.to_bytes(4, 'big')).digest()
+				counter += 1
+			
+			state = int.from_bytes(material, 'big') >> (len(material) * 8 - length)
+			return state or 1
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'length': self.length,
+				'taps': list(self.taps),
+				'state': self.state,
+				'word_index': self.word_index,
+				'pending': self._pending.hex(),
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.length = state['length']
+			self.taps = tuple(state['taps'])
+			self.state = state['state']
+			self.word_index = state['word_index']
+			self._pending = bytes.fromhex(state['pending'])
+			self._origin = state.get('origin') or state
+
+		def tell(self) -> int:
+			return 8 * self.word_index - len(self._pending)
+
+		def generate_block(self, num_words: int) -> int:
+			"""
+			Выдаёт следующие 64 * num_words бит последовательности одним целым числом.
+
+			Args:
+				num_words: количество 64-битных слов
+			
+			Returns:
+				int: биты последовательности, первый бит - старший
+			"""
+			length = self.length
+			state_mask = (1 << length) - 1
+			step_bits = self.word_bits * ((length - max(self.taps)) // self.word_bits)
+			state = self.state
+			remaining = self.word_bits * num_words
+			chunks = []
+
+			while remaining > 0:
+				w = min(step_bits, remaining)
+				feedback = 0
+				for k in self.taps:
+					feedback ^= state >> (length - w - k)
+				chunks.append((state >> (length - w)).to_bytes(w // 8, 'big'))
+				state = ((state << w) & state_mask) | (feedback & ((1 << w) - 1))
+				remaining -= w
+			
+			self.state = state
+			self.word_index += num_words
+			return int.from_bytes(b''.join(chunks), 'big')
+
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов
+			"""
+			data = bytearray(self._pending)
+			while len(data) < length:
+				count = min((length - len(data) + 7) // 8, self.max_batch_words)
+				data += self.generate_block(count).to_bytes(8 * count, 'big')
+			
+			self._pending = bytes(data[length:])
+			return bytes(data[:length])
+
+	class Geffe(LFSR):
+		"""
+		Генератор Геффе на трёх регистрах LFSR.
+
+		Выход: (x1 & x2) ^ (~x2 & x3), где x2 - управляющий регистр. Функция
+		применяется сразу ко всему блоку битов каждого регистра.
+		"""
+		kind = 'geffe'
+		registers = ((521, (32, 0)), (607, (105, 0)), (1279, (216, 0)))
+
+		def __init__(self, seed = None) -> None:
+			"""
+			Инициализирует три регистра взаимно простых периодов 2^521 - 1, 2^607 - 1, 2^1279 - 1.
+
+			Args:
+				seed: начальное значение (bytes, str или int)
+			"""
+			seed_bytes = _seed_to_bytes(seed)
+			self.lfsrs = [
+				Generator.LFSR(seed_bytes + bytes([i]), length, taps)
+				for i, (length, taps) in enumerate(self.registers)
+			]
+			self.word_index = 0
+			self._pending = b''
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'lfsrs': [lfsr.get_state() | {'origin': None} for lfsr in self.lfsrs],
+				'word_index': self.word_index,
+				'pending': self._pending.hex(),
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.lfsrs = [Generator.LFSR.from_state(lfsr) for lfsr in state['lfsrs']]
+			self.word_index = state['word_index']
+			self._pending = bytes.fromhex(state['pending'])
+			self._origin = state.get('origin') or state
+
+		def generate_block(self, num_words: int) -> int:
+			x1, x2, x3 = (lfsr.generate_block(num_words) for lfsr in self.lfsrs)
+			mask = (1 << (self.word_bits * num_words)) - 1
+			self.word_index += num_words
+			return (x1 & x2) ^ (~x2 & mask & x3)
+
+	class Shrinking(LFSR):
+		"""
+		Сжимающий генератор (Shrinking Generator) на двух регистрах LFSR.
+
+		Выдаются только те биты регистра A, для которых соответствующий бит
+		регистра S равен 1. Блоки обоих регистров переводятся в битовые строки,
+		и отбор выполняется одним вызовом itertools.compress на весь блок.
+		"""
+		kind = 'shrinking'
+		registers = ((607, (105, 0)), (1279, (216, 0)))
+		_selectors = bytes.maketrans(b'01', b'\x00\x01')
+
+		def __init__(self, seed = None) -> None:
+			"""
+			Инициализирует регистры A и S.
+
+			Args:
+				seed: начальное значение (bytes, str или int)
+			"""
+			seed_bytes = _seed_to_bytes(seed)
+			self.lfsrs = [
+				Generator.LFSR(seed_bytes + bytes([i]), length, taps)
+				for i, (length, taps) in enumerate(self.registers)
+			]
+			self.acc = 0
+			self.acc_bits = 0
+			self.position = 0
+			self._pending = b''
+			self._mark_origin()
+
+		def get_state(self) -> dict:
+			return {
+				'type': self.kind,
+				'lfsrs': [lfsr.get_state() | {'origin': None} for lfsr in self.lfsrs],
+				'acc': self.acc,
+				'acc_bits': self.acc_bits,
+				'pending': self._pending.hex(),
+				'position': self.position,
+				'origin': self._origin
+			}
+
+		def set_state(self, state: dict) -> None:
+			self.lfsrs = [Generator.LFSR.from_state(lfsr) for lfsr in state['lfsrs']]
+			self.acc = state['acc']
+			self.acc_bits = state['acc_bits']
+			self._pending = bytes.fromhex(state['pending'])
+			self.position = state['position']
+			self._origin = state.get('origin') or state
+
+		def tell(self) -> int:
+			return self.position
+
+		def generate_bytes(self, length: int) -> bytes:
+			"""
+			Генерирует псевдослучайную последовательность байтов.
+
+			Args:
+				length: количество байтов
+			
+			Returns:
+				bytes: последовательность байтов
+			"""
+			lfsr_a, lfsr_s = self.lfsrs
+			data = bytearray(self._pending)
+
+			while len(data) < length:
+				count = min((length - len(data)) // 4 + 1, self.max_batch_words)
+				num_bits = self.word_bits * count
+				a_bits = format(lfsr_a.generate_block(count), f'0{num_bits}b').encode()
+				s_bits = format(lfsr_s.generate_block(count), f'0{num_bits}b').encode().translate(self._selectors)
+				bits = bytes(compress(a_bits, s_bits))
+
+				total = self.acc_bits + len(bits)
+				value = (self.acc << len(bits)) | int(bits or b'0', 2)
+				rest = total & 7
+				data += (value >> rest).to_bytes(total >> 3, 'big')
+				self.acc = value & ((1 << rest) - 1)
+				self.acc_bits = rest
+			
+			self._pending = bytes(data[length:])
+			self.position += length
+			return bytes(data[:length])
+	
+	@classmethod
+	def restore(cls, state: dict) -> ResumableGenerator:
+		"""
+		Восстанавливает генератор любого типа из сохранённого состояния.
+
+		Args:
+			state: словарь, полученный методом get_state
+		
+		Returns:
+			ResumableGenerator: генератор, продолжающий последовательность с места сохранения
+		"""
+		for gen_cls in (
+			cls.QuadraticCongruential, cls.BlumBlumShub, cls.Yarrow160, cls.AESCounter,
+			cls.LFSR, cls.Geffe, cls.Shrinking
+		):
+			if gen_cls.kind == state.get('type'):
+				return gen_cls.from_state(state)
+		
+		raise ValueError(f"Неизвестный тип генератора: {state.get('type')}")
+
+	def quadratic_congruential_generator(self, seq_len: int = 10000, seed: int = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности квадратичным конгруэнтным генератором.
+
+		Args:
+			seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.QuadraticCongruential(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def quadratic_congruential_generator_bytes(self, length: int, seed: int = None) -> bytes:
+		"""
+		Генерирует последовательность байтов квадратичным конгруэнтным генератором.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.QuadraticCongruential(seed=seed)
+		return gen.generate_bytes(length)
+	
+	def bbs_generator(self, seq_len: int = 10000, seed: int = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности Блюма-Блюма-Шуба.
+
+		Args:
+			seq_len: длина генерируемой битовой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.BlumBlumShub(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def bbs_generator_bytes(self, length: int, seed: int = None) -> bytes:
+		"""
+		Генерирует последовательность байтов генератором Блюма-Блюма-Шуба.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.BlumBlumShub(seed=seed)
+		return gen.generate_bytes(length)
 	
 	def yarrow160_generator(self,  seq_len: int = 10000, seed: bytes = None) -> list[int]:
 		"""
@@ -280,3 +1206,120 @@ class Generator:
 		gen = self.Yarrow160(seed=seed)
 		bit_seq = gen.generate_bits(seq_len)
 		return bit_seq
+	
+	def yarrow160_generator_bytes(self, length: int, seed: bytes = None) -> bytes:
+		"""
+		Генерирует последовательность байтов генератором Yarrow-160.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.Yarrow160(seed=seed)
+		return gen.generate_bytes(length)
+	
+	def aes_ctr_generator(self, seq_len: int = 10000, seed: bytes = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности AES-CTR.
+
+		Args:
+			seq_len: длина генерируемой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.AESCounter(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def aes_ctr_generator_bytes(self, length: int, seed: bytes = None) -> bytes:
+		"""
+		Генерирует последовательность байтов генератором AES-CTR.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.AESCounter(seed=seed)
+		return gen.generate_bytes(length)
+	
+	def lfsr_generator(self, seq_len: int = 10000, seed: bytes = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности LFSR.
+
+		Args:
+			seq_len: длина генерируемой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.LFSR(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def lfsr_generator_bytes(self, length: int, seed: bytes = None) -> bytes:
+		"""
+		Генерирует последовательность байтов генератором LFSR.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.LFSR(seed=seed)
+		return gen.generate_bytes(length)
+	
+	def geffe_generator(self, seq_len: int = 10000, seed: bytes = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности Геффе.
+
+		Args:
+			seq_len: длина генерируемой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.Geffe(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def geffe_generator_bytes(self, length: int, seed: bytes = None) -> bytes:
+		"""
+		Генерирует последовательность байтов генератором Геффе.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.Geffe(seed=seed)
+		return gen.generate_bytes(length)
+	
+	def shrinking_generator(self, seq_len: int = 10000, seed: bytes = None) -> list[int]:
+		"""
+		Интерфейсная функция для генерации последовательности сжимающего генератора.
+
+		Args:
+			seq_len: длина генерируемой последовательности (по умолчанию 10000)
+		
+		Returns:
+			List[int]: список битов (0 и 1)
+		"""
+		gen = self.Shrinking(seed=seed)
+		return gen.generate_bits(seq_len)
+	
+	def shrinking_generator_bytes(self, length: int, seed: bytes = None) -> bytes:
+		"""
+		Генерирует последовательность байтов сжимающим генератором.
+
+		Args:
+			length: количество байтов
+		
+		Returns:
+			bytes: последовательность байтов
+		"""
+		gen = self.Shrinking(seed=seed)
+		return gen.generate_bytes(length)
@@ -0,0 +1,204 @@
+import argparse
+import json
+import math
+import numpy as np
+from hash_functions import HashFunctions
+
+
+def random_inputs(count: int, length: int = 16, batch_size: int = 100000, seed: int = None):
+	"""
+	Генерирует случайные входы одинаковой длины пакетами.
+
+	Yields:
+		np.ndarray: двумерный массив uint8 формы (размер пакета, length)
+	"""
+	rng = np.random.default_rng(seed)
+	for start in range(0, count, batch_size):
+		size = min(batch_size, count - start)
+		yield rng.integers(0, 256, size=(size, length), dtype=np.uint8)
+
+
+def structured_inputs(count: int, prefix: bytes = b'user', batch_size: int = 100000):
+	"""
+	Генерирует структурированные входы вида prefix + номер (b'user0', b'user1', ...).
+
+	Такие ключи отличаются в нескольких последних байтах и типичны для
+	идентификаторов и паролей.
+
+	Yields:
+		list[bytes]: пакет ключей
+	"""
+	for start in range(0, count, batch_size):
+		yield [prefix + str(i).encode() for i in range(start, min(start + batch_size, count))]
+
+
+class HashAnalyzer:
+	"""
+	Потоковый анализ распределения и лавинного эффекта ma_prime.
+
+	Дайджесты вычисляются пакетами через ma_prime_hash_batch и сразу
+	учитываются в статистике, поэтому память не зависит от числа входов:
+	- счётчики корзин для критерия хи-квадрат,
+	- битовая карта всех 2^32 значений для подсчёта коллизий (512 МБ
+	  виртуальной памяти, физически занимаются только затронутые страницы),
+	- матрица частот инверсии выходных битов при инверсии входного бита.
+
+	Коллизией считается повтор дайджеста, поэтому входы должны быть различными.
+	"""
+	def __init__(self, buckets: int = 65536, track_collisions: bool = True) -> None:
+		"""
+		Args:
+			buckets: количество корзин (дайджест берётся по модулю buckets)
+			track_collisions: вести битовую карту для подсчёта коллизий
+		"""
+		self.buckets = buckets
+		self.bucket_counts = np.zeros(buckets, dtype=np.int64)
+		self.total = 0
+		self.collisions = 0
+		self.seen = np.zeros(1 << 29, dtype=np.uint8) if track_collisions else None
+		self.flip_counts = None
+		self.avalanche_samples = 0
+
+	def add(self, keys, lengths=None) -> np.ndarray:
+		"""
+		Хеширует пакет входов и учитывает дайджесты в статистике.
+
+		Args:
+			keys: список байтовых строк или двумерный массив uint8
+			lengths: длины строк двумерного массива
+
+		Returns:
+			np.ndarray: дайджесты пакета (uint32)
+		"""
+		digests = HashFunctions.ma_prime_hash_batch(keys, lengths)
+		self.add_digests(digests)
+		return digests
+
+	def add_digests(self, digests: np.ndarray) -> None:
+		self.total += len(digests)
+		self.bucket_counts += np.bincount(digests % self.buckets, minlength=self.buckets)
+
+		if self.seen is not None:
+			unique = np.unique(digests)
+			self.collisions += len(digests) - len(unique)
+
+			byte_index = unique >> 3
+			bit = np.uint8(1) << (unique & 7).astype(np.uint8)
+			self.collisions += int(np.count_nonzero(self.seen[byte_index] & bit))
+			np.bitwise_or.at(self.seen, byte_index, bit)
+
+	def add_avalanche(self, matrix: np.ndarray) -> None:
+		"""
+		Оценивает лавинный эффект на пакете входов одинаковой длины.
+
+		Для каждого входного бита все строки хешируются с инвертированным
+		битом, и подсчитывается, какие биты дайджеста изменились.
+
+		Args:
+			matrix: двумерный массив uint8 (строки - входы)
+		"""
+		width = matrix.shape[1]
+		if self.flip_counts is None:
+			self.flip_counts = np.zeros((8 * width, 32), dtype=np.int64)
+		elif self.flip_counts.shape[0] != 8 * width:
+			raise ValueError("Длина входов должна совпадать с предыдущими пакетами")
+
+		base = HashFunctions.ma_prime_hash_batch(matrix)
+		shifts = np.arange(31, -1, -1, dtype=np.uint32)
+		flipped = matrix.copy()
+
+		for position in range(8 * width):
+			mask = np.uint8(0x80 >> (position % 8))
+			column = position // 8
+			flipped[:, column] ^= mask
+			diff = base ^ HashFunctions.ma_prime_hash_batch(flipped)
+			flipped[:, column] ^= mask
+			self.flip_counts[position] += ((diff[:, None] >> shifts) & 1).sum(axis=0, dtype=np.int64)
+
+		self.avalanche_samples += len(matrix)
+
+	def chi_square(self) -> dict:
+		"""
+		Критерий хи-квадрат равномерности заполнения корзин.
+
+		Returns:
+			dict: статистика, число степеней свободы и нормированное отклонение
+			z = (chi2 - df) / sqrt(2 df)
+		"""
+		expected = self.total / self.buckets
+		if expected == 0:
+			raise ValueError("Нет данных для анализа")
+
+		statistic = float(((self.bucket_counts - expected) ** 2).sum() / expected)
+		dof = self.buckets - 1
+		return {
+			'statistic': statistic,
+			'degrees_of_freedom': dof,
+			'z_score': (statistic - dof) / math.sqrt(2 * dof),
+		}
+
+	def flip_probabilities(self) -> np.ndarray:
+		"""
+		Матрица вероятностей инверсии: строка - входной бит, столбец - бит дайджеста
+		(старший бит первым). Для идеальной хеш-функции все значения близки к 0.5.
+		"""
+		if not self.avalanche_samples:
+			raise ValueError("Нет данных для анализа лавинного эффекта")
+		return self.flip_counts / self.avalanche_samples
+
+	def expected_collisions(self) -> float:
+		return self.total * (self.total - 1) / 2 / 2 ** 32
+
+	def report(self) -> dict:
+		result = {
+			'inputs': self.total,
+			'buckets': self.buckets,
+			'chi_square': self.chi_square(),
+		}
+
+		if self.seen is not None:
+			result['collisions'] = self.collisions
+			result['expected_collisions'] = self.expected_collisions()
+
+		if self.avalanche_samples:
+			probabilities = self.flip_probabilities()
+			result['avalanche'] = {
+				'samples': self.avalanche_samples,
+				'mean_flip_probability': float(probabilities.mean()),
+				'max_bias': float(np.abs(probabilities - 0.5).max()),
+				'per_output_bit': probabilities.mean(axis=0).round(4).tolist(),
+			}
+
+		return result
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Анализ распределения и лавинного эффекта ma_prime")
+	parser.add_argument('--count', type=int, default=1000000)
+	parser.add_argument('--inputs', choices=['random', 'structured'], default='random')
+	parser.add_argument('--length', type=int, default=16, help="длина случайных входов")
+	parser.add_argument('--buckets', type=int, default=65536)
+	parser.add_argument('--avalanche-samples', type=int, default=10000)
+	parser.add_argument('--output', default=None)
+	args = parser.parse_args()
+
+	analyzer = HashAnalyzer(args.buckets)
+	if args.inputs == 'random':
+		batches = random_inputs(args.count, args.length)
+	else:
+		batches = structured_inputs(args.count)
+	for batch in batches:
+		analyzer.add(batch)
+
+	for batch in random_inputs(args.avalanche_samples, args.length):
+		analyzer.add_avalanche(batch)
+
+	report = analyzer.report()
+	print(json.dumps(report, indent=4))
+	if args.output is not None:
+		with open(args.output, 'w', encoding='utf-8') as f:
+			json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+	main()
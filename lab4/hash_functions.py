@@ -1,4 +1,6 @@
 import hashlib
+import struct
+import numpy as np
 
 sTable = [
 	0xa3, 0xd7, 0x09, 0x83, 0xf8, 0x48, 0xf6, 0xf4, 0xb3, 0x21, 0x15, 0x78, 0x99, 0xb1, 0xaf, 0xf9,
@@ -19,14 +21,52 @@ sTable = [
 	0x5e, 0x6c, 0xa9, 0x13, 0x57, 0x25, 0xb5, 0xe3, 0xbd, 0xa8, 0x3a, 0x01, 0x05, 0x59, 0x2a, 0x46
 ]
 
+_S_TABLE = np.array(sTable, dtype=np.uint32)
+
+_MASK_64 = (1 << 64) - 1
+_MASK_256 = (1 << 256) - 1
+
+_GOST_LANES = sum(1 << (64 * i) for i in range(4))
+_GOST_EVEN_BYTES = 0xFF * (_MASK_256 // 0xFFFF)
+_GOST_SBOX_ADD = 173 * (_MASK_256 // 0xFFFF)
+_GOST_ROTATE_HIGH = (_MASK_64 ^ ((1 << 11) - 1)) * _GOST_LANES
+_GOST_ROTATE_LOW = ((1 << 11) - 1) * _GOST_LANES
+_GOST_SCHEDULE = [
+	(round_num % 4 if round_num < 8 else 4 + (round_num // 4) % 4,
+	 (round_num ^ ((0xFF - round_num) << 56)) * _GOST_LANES)
+	for round_num in range(32)
+]
+_GOST_SBOX_TABLE = np.array([(v * 17 + 173) & 0xFF for v in range(256)], dtype=np.uint8)
+_GOST_N_STEP = sum(256 << (8 * i) for i in range(32)) & _MASK_256
+
 class HashFunctions:
+	@staticmethod
+	def new(name: str, data: bytes = b''):
+		"""
+		Создаёт объект хеширования с интерфейсом hashlib (update, digest, hexdigest, copy).
+
+		Args:
+			name: 'ma_prime', 'gost' или алгоритм hashlib ('md5', 'sha1', 'sha256')
+			data: начальные данные
+		"""
+		if name == 'ma_prime':
+			return MaPrimeHash(data)
+		elif name == 'gost':
+			return GostHash(data)
+		elif name in ('md5', 'sha1', 'sha256'):
+			return hashlib.new(name, data)
+		else:
+			raise ValueError(f"Unsupported algorithm: {name}")
+
 	@staticmethod
 	def ma_prime_hash(data: bytes) -> int:
+		return HashFunctions._ma_prime_update(MaPrimeHash.START_PRIME, data, 0)
+
+	@staticmethod
+	def _ma_prime_update(hval: int, data: bytes, position: int) -> int:
 		PRIME_MULT = 0x1FAF
-		START_PRIME = 0x3A8F05C5
-		hval = START_PRIME
 
-		for i, byte in enumerate(data):
+		for i, byte in enumerate(data, position):
 			index = (byte + i) & 0xFF
 			hval ^= sTable[index]
 			hval = (hval * PRIME_MULT) & 0xFFFFFFFF
@@ -34,128 +74,243 @@ class HashFunctions:
 		return hval
 
 	@staticmethod
-	def gost_341194_hash(data: bytes) -> bytes:
-		BLOCK_SIZE = 32
-		h = bytearray([0] * BLOCK_SIZE)
-		N = bytearray([0] * BLOCK_SIZE)
-		Sigma = bytearray([0] * BLOCK_SIZE)
-		original_len = len(data)
-		data = bytearray(data)
-		data.append(0x01)
-
-		while len(data) % BLOCK_SIZE != 0:
-			data.append(0x00)
-		
-		for i in range(0, len(data), BLOCK_SIZE):
-			block = data[i:i + BLOCK_SIZE]
-			h = HashFunctions._gost_compression_function(h, block, N, Sigma)
-			
-			N = HashFunctions._add_mod_2_512(N, [BLOCK_SIZE * 8] * BLOCK_SIZE)
-			Sigma = HashFunctions._add_mod_2_512(Sigma, [int(b) for b in block])
+	def ma_prime_hash_batch(keys, lengths=None) -> np.ndarray:
+		"""
+		Вычисляет ma_prime сразу для множества ключей.
+
+		Все ключи обрабатываются одновременно: на каждой позиции выполняются
+		векторные операции uint32 над строками, ещё не дошедшими до конца.
+		Строки упорядочиваются по убыванию длины, поэтому активные строки
+		всегда занимают начало массива.
+
+		Args:
+			keys: список байтовых строк или двумерный массив uint8 (строки дополнены справа)
+			lengths: длины строк для двумерного массива (по умолчанию - полная ширина)
 		
-		return bytes(h)
-	
-	@staticmethod
-	def _gost_compression_function(
-		h: bytearray,
-		m: bytes,
-		N: bytearray,
-		Sigma: bytearray
-	) -> bytearray:
-		keys = HashFunctions._gost_key_schedule(h, N)
-		result = bytearray(32)
+		Returns:
+			np.ndarray: массив uint32 значений, совпадающих с ma_prime_hash
+		"""
+		if isinstance(keys, np.ndarray):
+			if keys.ndim != 2:
+				raise ValueError("Ожидается двумерный массив uint8")
+			matrix = keys.astype(np.uint8, copy=False)
+			if lengths is None:
+				lengths = np.full(len(matrix), matrix.shape[1], dtype=np.int64)
+			lengths = np.asarray(lengths, dtype=np.int64)
+			if len(lengths) != len(matrix) or (lengths > matrix.shape[1]).any():
+				raise ValueError("Длины строк не соответствуют массиву")
+		else:
+			lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+			width = int(lengths.max()) if len(keys) else 0
+			matrix = np.zeros((len(keys), width), dtype=np.uint8)
+			matrix[np.arange(width) < lengths[:, None]] = np.frombuffer(b''.join(keys), dtype=np.uint8)
 
-		for i in range(4):
-			block_start = i * 8
-			block_end = block_start + 8
-			data_block = m[block_start:block_end]
-			h_block = h[block_start:block_end]
+		# Устойчивая сортировка 16-битных ключей выполняется поразрядно.
+		sort_dtype = np.uint16 if matrix.shape[1] < (1 << 16) else np.int64
+		order = np.argsort((matrix.shape[1] - lengths).astype(sort_dtype), kind='stable')
+		sorted_lengths = lengths[order]
+		columns = np.take(matrix, order, axis=0).T.copy()
+		hvals = np.full(len(order), MaPrimeHash.START_PRIME, dtype=np.uint32)
+		prime_mult = np.uint32(0x1FAF)
 
-			transformed = HashFunctions._gost_transform_block(data_block, keys)
+		positions = np.arange(256)
 
-			for j in range(8):
-				result[block_start + j] = transformed[j] ^ h_block[j]
-		
+		for i in range(columns.shape[0]):
+			active = int(np.searchsorted(-sorted_lengths, -i, side='left'))
+			if active == 0:
+				break
+			# Сдвиг индекса на позицию i учитывается поворотом таблицы.
+			table = _S_TABLE[(positions + i) & 0xFF]
+			current = hvals[:active]
+			np.bitwise_xor(current, table[columns[i, :active]], out=current)
+			np.multiply(current, prime_mult, out=current)
+
+		result = np.empty_like(hvals)
+		result[order] = hvals
 		return result
-		
+
 	@staticmethod
-	def _gost_key_schedule(K: bytearray, N: bytearray) -> list:
-		keys = []
-
-		k_blocks = [K[i:i + 8] for i in range(0, 32, 8)]
-		n_blocks = [N[i:i + 8] for i in range(0, 32, 8)]
-
-		for round_num in range(32):
-			if round_num < 8:
-				key_source = k_blocks
-				key_index = round_num % 4
-			else:
-				key_source = n_blocks
-				key_index = (round_num // 4) % 4
-			
-			key = bytearray(key_source[key_index])
-			key[0] ^= round_num
-			key[7] ^= 0xFF - round_num
-
-			keys.append(bytes(key))
-		
-		return keys
+	def gost_341194_hash(data: bytes) -> bytes:
+		return GostHash(data).digest()
 	
 	@staticmethod
-	def _gost_transform_block(block: bytes, keys: list) -> bytes:
-		state = bytearray(block)
-
-		for round_num in range(32):
-			key = keys[round_num]
-			
-			for j in range(8):
-				state[j] ^= key[j]
-			
-			for j in range(8):
-				state[j] = HashFunctions._gost_sbox(state[j])
-			
-			state = HashFunctions._gost_rotate_left(state, 11)
+	def gost_341194_hash_batch(messages) -> np.ndarray:
+		"""
+		Вычисляет ГОСТ Р 34.11-94 сразу для множества сообщений одинаковой длины.
+
+		Состояние каждого сообщения - строка из четырёх 64-битных полос массива,
+		все сообщения проходят раунды одновременно. Счётчик N у сообщений общий,
+		поэтому ключи раундов 8-31 вычисляются один раз на пакет.
+
+		Args:
+			messages: список байтовых строк одинаковой длины или двумерный массив uint8
 		
-		return bytes(state)
+		Returns:
+			np.ndarray: массив uint8 формы (число сообщений, 32), строка i - дайджест сообщения i
+		"""
+		if isinstance(messages, np.ndarray):
+			if messages.ndim != 2:
+				raise ValueError("Ожидается двумерный массив uint8")
+			matrix = messages.astype(np.uint8, copy=False)
+		else:
+			lengths = set(map(len, messages))
+			if len(lengths) > 1:
+				raise ValueError("Сообщения пакета должны иметь одинаковую длину")
+			length = lengths.pop() if lengths else 0
+			matrix = np.frombuffer(b''.join(messages), dtype=np.uint8).reshape(len(messages), length)
 
-	@staticmethod
-	def _gost_sbox(value: int) -> int:
-		return (value * 17 + 173) & 0xFF
+		count, length = matrix.shape
+		padded = np.zeros((count, (length // 32 + 1) * 32), dtype=np.uint8)
+		padded[:, :length] = matrix
+		padded[:, length] = 0x01
+		blocks = padded.view('<u8')
+
+		h = np.zeros((count, 4), dtype='<u8')
+		N = 0
+		shift_left = np.uint64(11)
+		shift_right = np.uint64(53)
+
+		for start in range(0, blocks.shape[1], 4):
+			n_lanes = struct.unpack('<4Q', N.to_bytes(32, 'big'))
+			state = blocks[:, start:start + 4].copy()
+
+			for round_num in range(32):
+				const = round_num ^ ((0xFF - round_num) << 56)
+				if round_num < 8:
+					state ^= (h[:, round_num % 4] ^ np.uint64(const))[:, None]
+				else:
+					state ^= np.uint64(n_lanes[(round_num // 4) % 4] ^ const)
+
+				state = _GOST_SBOX_TABLE[state.view(np.uint8)].view('<u8')
+				state = (state << shift_left) | (state >> shift_right)
+
+			h = state ^ h
+			N = (N + _GOST_N_STEP) & _MASK_256
+
+		return h.view(np.uint8)
 
 	@staticmethod
-	def _gost_rotate_left(data: bytearray, bits: int) -> bytearray:
-		result = bytearray(len(data))
-		byte_shift = bits // 8
-		bit_shft = bits % 8
-
-		for i in range(len(data)):
-			byte1 = data[(i - byte_shift) % len(data)]
-			byte2 = data[(i - byte_shift - 1) % len(data)]
-			result[i] = ((byte1 << bit_shft) | (byte2 >> (8 - bit_shft))) & 0xFF
+	def _gost_compression_function(h: int, m: bytes, N: int) -> int:
+		# Четыре 64-битных подблока обрабатываются одновременно как полосы
+		# одного 256-битного числа (подблок i - байты 8i..8i+7, little-endian).
+		keys = HashFunctions._gost_key_schedule(h, N)
+		return HashFunctions._gost_transform_lanes(int.from_bytes(m, 'little'), keys) ^ h
 		
-		return result
-
+	@staticmethod
+	def _gost_key_schedule(K: int, N: int) -> list:
+		lanes = [
+			word * _GOST_LANES
+			for word in struct.unpack('<8Q', K.to_bytes(32, 'little') + N.to_bytes(32, 'big'))
+		]
+		return [lanes[index] ^ const for index, const in _GOST_SCHEDULE]
 	
 	@staticmethod
-	def _add_mod_2_512(a: bytearray, b: list) -> bytearray:
-		result = bytearray(32)
-		carry = 0
-		
-		for i in range(31, -1, -1):
-			total = a[i] + b[i] + carry
-			result[i] = total & 0xFF
-			carry = total >> 8
+	def _gost_transform_lanes(state: int, keys: list) -> int:
+		for key in keys:
+			state ^= key
+
+			# S-блок v -> 17v + 173 (mod 256): чётные и нечётные байты разносятся
+			# по 16-битным ячейкам, где умножение не даёт переноса в соседний байт.
+			even = ((state & _GOST_EVEN_BYTES) * 17 + _GOST_SBOX_ADD) & _GOST_EVEN_BYTES
+			odd = (((state >> 8) & _GOST_EVEN_BYTES) * 17 + _GOST_SBOX_ADD) & _GOST_EVEN_BYTES
+			state = even | (odd << 8)
+
+			state = ((state << 11) & _GOST_ROTATE_HIGH) | ((state >> 53) & _GOST_ROTATE_LOW)
 		
-		return result
+		return state
 	
 	@staticmethod
 	def ready_hash(data: bytes, algorithm: str = 'sha256') -> bytes:
-		if algorithm == 'md5':
-			return hashlib.md5(data).digest()
-		elif algorithm == 'sha1':
-			return hashlib.sha1(data).digest()
-		elif algorithm == 'sha256':
-			return hashlib.sha256(data).digest()
-		else:
-			raise ValueError(f"Unsupported algorithm: {algorithm}")
-		
\ No newline at end of file
+		return HashFunctions.new(algorithm, data).digest()
+
+
+class MaPrimeHash:
+	"""
+	Инкрементальный ma_prime с интерфейсом hashlib.
+
+	Результат ma_prime зависит от позиции байта, поэтому объект хранит
+	количество уже обработанных байтов. Дайджест - 4 байта big-endian.
+	"""
+	name = 'ma_prime'
+	digest_size = 4
+	block_size = 1
+	START_PRIME = 0x3A8F05C5
+
+	def __init__(self, data: bytes = b'') -> None:
+		self.hval = self.START_PRIME
+		self.position = 0
+		self.update(data)
+
+	def update(self, data: bytes) -> None:
+		self.hval = HashFunctions._ma_prime_update(self.hval, data, self.position)
+		self.position += len(data)
+
+	def intdigest(self) -> int:
+		return self.hval
+
+	def digest(self) -> bytes:
+		return self.hval.to_bytes(self.digest_size, 'big')
+
+	def hexdigest(self) -> str:
+		return self.digest().hex()
+
+	def copy(self) -> 'MaPrimeHash':
+		other = MaPrimeHash.__new__(MaPrimeHash)
+		other.hval = self.hval
+		other.position = self.position
+		return other
+
+
+class GostHash:
+	"""
+	Инкрементальный ГОСТ Р 34.11-94 с интерфейсом hashlib.
+
+	Полные 32-байтовые блоки сжимаются сразу, в буфере остаётся не более
+	31 байта, поэтому память не зависит от длины входа. Дополнение
+	выполняется только в digest и не меняет состояние объекта.
+	"""
+	name = 'gost'
+	digest_size = 32
+	block_size = 32
+
+	def __init__(self, data: bytes = b'') -> None:
+		self.h = 0
+		self.N = 0
+		self.buffer = b''
+		self.update(data)
+
+	def update(self, data: bytes) -> None:
+		view = memoryview(data).cast('B')
+		start = 0
+
+		if self.buffer:
+			start = min(self.block_size - len(self.buffer), len(view))
+			self.buffer += view[:start]
+			if len(self.buffer) < self.block_size:
+				return
+			self._compress(self.buffer)
+
+		end = start + (len(view) - start) // self.block_size * self.block_size
+		for i in range(start, end, self.block_size):
+			self._compress(view[i:i + self.block_size])
+		self.buffer = bytes(view[end:])
+
+	def _compress(self, block) -> None:
+		self.h = HashFunctions._gost_compression_function(self.h, block, self.N)
+		self.N = (self.N + _GOST_N_STEP) & _MASK_256
+
+	def digest(self) -> bytes:
+		final = self.copy()
+		tail = self.buffer + b'\x01'
+		final._compress(tail + bytes(self.block_size - len(tail)))
+		return final.h.to_bytes(self.digest_size, 'little')
+
+	def hexdigest(self) -> str:
+		return self.digest().hex()
+
+	def copy(self) -> 'GostHash':
+		other = GostHash.__new__(GostHash)
+		other.h = self.h
+		other.N = self.N
+		other.buffer = self.buffer
+		return other
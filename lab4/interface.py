@@ -155,6 +155,12 @@ class Interface:
 			default=self.config.get("default_hash_algorithm", "gost")
 		)
 
+		generator_type = Prompt.ask(
+			"[bold yellow]Выберите генератор ПСЧ[/bold yellow]",
+			choices=["quadratic", "yarrow160", "aes-ctr", "lfsr", "geffe", "shrinking"],
+			default=self.config.get("default_generator", "yarrow160")
+		)
+
 		self.config["input_file_path"] = input_file
 		self.config["output_file_path"] = output_file
 		self._save_config()
@@ -168,7 +174,7 @@ class Interface:
 		) as progress:
 			task = progress.add_task("Шифрование...", total=100)
 			success = self.cipher.encrypt_decrypt_file(
-				input_file, output_file, password, hash_algo, "yarrow160"
+				input_file, output_file, password, hash_algo, generator_type
 			)
 
 			progress.update(task, completed=100)
@@ -225,6 +231,12 @@ class Interface:
 			default=self.config.get("default_hash_algirithm", "gost")
 		)
 
+		generator_type = Prompt.ask(
+			"[bold yellow]Выберите генератор ПСЧ[/bold yellow]",
+			choices=["quadratic", "yarrow160", "aes-ctr", "lfsr", "geffe", "shrinking"],
+			default=self.config.get("default_generator", "yarrow160")
+		)
+
 		self.config["input_file_path"] = input_file
 		self.config["output_file_path"] = output_file
 		self._save_config()
@@ -238,7 +250,7 @@ class Interface:
 		) as progress:
 			task = progress.add_task("Дешифрование...", total=100)
 			success = self.cipher.encrypt_decrypt_file(
-				input_file, output_file, password, hash_algo, "yarrow160"
+				input_file, output_file, password, hash_algo, generator_type
 			)
 
 			progress.update(task, completed=100)
@@ -609,7 +621,12 @@ class Interface:
 			"• [cyan]ma_prime[/cyan] - собственная реализация MaPrime\n"
 			"• [cyan]gost[/cyan] - собственная реализация ГОСТ Р 34.11-94\n\n"
 			"[bold]Генераторы ПСЧ:[/bold]\n"
-			"• [cyan]yarrow160[/cyan] - криптографический генератор Yarrow-160\n\n"
+			"• [cyan]quadratic[/cyan] - квадратичный конгруэнтный генератор\n"
+			"• [cyan]yarrow160[/cyan] - криптографический генератор Yarrow-160\n"
+			"• [cyan]aes-ctr[/cyan] - генератор на основе AES-256 в режиме счётчика\n"
+			"• [cyan]lfsr[/cyan] - регистр сдвига с линейной обратной связью\n"
+			"• [cyan]geffe[/cyan] - генератор Геффе на трёх LFSR\n"
+			"• [cyan]shrinking[/cyan] - сжимающий генератор на двух LFSR\n\n"
 			"[bold]Блочные шифры:[/bold]"
 			"• [cyan]Скремблирование (7 байт)[/cyan]\n"
 			"• [cyan]Режим CBC[/cyan]\n"
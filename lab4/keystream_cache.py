@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+from generator import Generator, ResumableGenerator
+
+
+class KeystreamCache:
+	"""
+	LRU-кеш детерминированных ключевых потоков.
+
+	Запись кеша хранит уже выданный префикс потока и генератор, остановленный
+	в конце этого префикса. Запрос более длинного потока продолжает генератор
+	с места остановки, а не пересчитывает последовательность с начала.
+
+	При превышении max_bytes наименее используемые записи вытесняются. Если
+	задан spill_dir, вытесненные записи сохраняются на диск (состояние генератора
+	в JSON и префикс потока) и загружаются обратно при следующем обращении.
+	Файлы содержат ключевой поток в открытом виде, поэтому каталог должен быть
+	доступен только владельцу.
+
+	Кеш потокобезопасен: общая блокировка защищает только таблицу записей, а
+	генерация выполняется под блокировкой своей записи. Потоки, запросившие
+	один ключ, дожидаются друг друга и используют уже выработанный префикс,
+	запросы разных ключей выполняются параллельно.
+	"""
+	def __init__(self, max_bytes: int = 64 * 1024 * 1024, spill_dir: str = None) -> None:
+		"""
+		Args:
+			max_bytes: максимальный суммарный размер префиксов в памяти
+			spill_dir: каталог для вытесненных записей (None - записи удаляются)
+		"""
+		self.max_bytes = max_bytes
+		self.spill_dir = spill_dir
+		self.entries = OrderedDict()
+		self.size = 0
+		self._lock = threading.Lock()
+
+		if spill_dir is not None:
+			os.makedirs(spill_dir, mode=0o700, exist_ok=True)
+
+	@staticmethod
+	def make_key(password_bytes: bytes, hash_algorithm: str, generator_type: str) -> tuple:
+		"""
+		Формирует ключ кеша (дайджест пароля, алгоритм хеширования, тип генератора).
+
+		Сам пароль в ключе не хранится.
+		"""
+		return (hashlib.sha256(password_bytes).hexdigest(), hash_algorithm, generator_type)
+
+	def get(self, key: tuple, length: int, factory: Callable[[], ResumableGenerator]) -> bytes:
+		"""
+		Возвращает первые length байт потока для ключа key.
+
+		Args:
+			key: ключ, полученный make_key
+			length: требуемая длина префикса
+			factory: функция, создающая генератор при отсутствии записи
+
+		Returns:
+			bytes: префикс ключевого потока
+		"""
+		while True:
+			entry = self._acquire_entry(key)
+			with entry['lock']:
+				if entry['evicted']:
+					continue
+
+				if entry['generator'] is None:
+					entry['generator'] = factory()
+
+				data = entry['data']
+				if len(data) < length:
+					extra = entry['generator'].generate_bytes(length - len(data))
+					data += extra
+					with self._lock:
+						if not entry['evicted']:
+							self.size += len(extra)
+				result = bytes(data[:length])
+				break
+
+		with self._lock:
+			self._evict()
+
+		return result
+
+	def iter_chunks(
+			self,
+			key: tuple,
+			total: int,
+			factory: Callable[[], ResumableGenerator],
+			chunk_size: int = 1 << 20
+	):
+		"""
+		Итератор по фрагментам первых total байт потока для ключа key.
+
+		Уже выработанный префикс берётся из кеша (при отсутствии записи в кеш
+		добавляется первый фрагмент). Продолжение вырабатывает копия генератора,
+		восстановленная из его состояния, и в кеш не сохраняется, поэтому
+		память ограничена размером кеша и фрагмента, а не длиной потока.
+
+		Yields:
+			bytes: очередной фрагмент длиной ровно chunk_size байт (последний - не более)
+		"""
+		self.get(key, min(total, chunk_size), factory)
+		prefix, continuation = self._snapshot(key, total, factory)
+
+		if continuation is None:
+			for start in range(0, len(prefix), chunk_size):
+				yield prefix[start:start + chunk_size]
+			return
+
+		# Длина префикса в кеше не обязательно кратна chunk_size: неполный
+		# последний фрагмент префикса дополняется началом продолжения, чтобы
+		# фрагменты потока совпадали с фрагментами данных той же длины.
+		full = len(prefix) - len(prefix) % chunk_size
+		for start in range(0, full, chunk_size):
+			yield prefix[start:start + chunk_size]
+
+		remaining = total - len(prefix)
+		if full < len(prefix):
+			head = continuation.generate_bytes(min(chunk_size - (len(prefix) - full), remaining))
+			yield prefix[full:] + head
+			remaining -= len(head)
+
+		yield from continuation.iter_chunks(chunk_size, remaining)
+
+	def _snapshot(self, key: tuple, length: int, factory: Callable[[], ResumableGenerator]) -> tuple:
+		while True:
+			entry = self._acquire_entry(key)
+			with entry['lock']:
+				if entry['evicted']:
+					continue
+
+				if entry['generator'] is None:
+					entry['generator'] = factory()
+
+				prefix = bytes(entry['data'][:length])
+				continuation = None
+				if length > len(prefix):
+					continuation = Generator.restore(entry['generator'].get_state())
+				return prefix, continuation
+
+	def clear(self) -> None:
+		with self._lock:
+			for entry in self.entries.values():
+				entry['evicted'] = True
+			self.entries.clear()
+			self.size = 0
+
+	def _acquire_entry(self, key: tuple) -> dict:
+		with self._lock:
+			entry = self.entries.get(key)
+			if entry is not None:
+				self.entries.move_to_end(key)
+				return entry
+
+			entry = self._load_spilled(key)
+			if entry is None:
+				entry = {'generator': None, 'data': bytearray()}
+			entry['lock'] = threading.Lock()
+			entry['evicted'] = False
+			self.entries[key] = entry
+			self.size += len(entry['data'])
+			return entry
+
+	def _evict(self) -> None:
+		# Записи, занятые другими потоками, пропускаются: их генератор сейчас
+		# изменяется, и сохранять его состояние нельзя.
+		for key in list(self.entries):
+			if self.size <= self.max_bytes:
+				break
+
+			entry = self.entries[key]
+			if not entry['lock'].acquire(blocking=False):
+				continue
+			try:
+				del self.entries[key]
+				entry['evicted'] = True
+				self.size -= len(entry['data'])
+				if self.spill_dir is not None and entry['generator'] is not None:
+					self._spill(key, entry)
+			finally:
+				entry['lock'].release()
+
+	def _spill_path(self, key: tuple) -> str:
+		name = hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+		return os.path.join(self.spill_dir, name)
+
+	def _spill(self, key: tuple, entry: dict) -> None:
+		path = self._spill_path(key)
+		with open(path + '.json', 'w', encoding='utf-8') as f:
+			json.dump(entry['generator'].get_state(), f)
+		with open(path + '.bin', 'wb') as f:
+			f.write(entry['data'])
+
+	def _load_spilled(self, key: tuple) -> dict | None:
+		if self.spill_dir is None:
+			return None
+
+		path = self._spill_path(key)
+		try:
+			with open(path + '.json', 'r', encoding='utf-8') as f:
+				state = json.load(f)
+			with open(path + '.bin', 'rb') as f:
+				data = bytearray(f.read())
+		except FileNotFoundError:
+			return None
+
+		os.remove(path + '.json')
+		os.remove(path + '.bin')
+		return {'generator': Generator.restore(state), 'data': data}
+
+
+default_cache = KeystreamCache()
@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from hash_functions import HashFunctions
+
+
+_LEET = str.maketrans({'a': '4', 'e': '3', 'i': '1', 'o': '0', 's': '5', 't': '7'})
+
+DEFAULT_RULES = (
+	['identity', 'capitalize', 'upper', 'reverse', 'leet', 'append:!', 'append:123']
+	+ [f'append:{i}' for i in range(10)]
+	+ [f'append:{i:02d}' for i in range(100)]
+	+ [f'append:{year}' for year in range(1970, 2031)]
+)
+
+
+def apply_rule(rule: str, word: str) -> str:
+	"""
+	Применяет правило мутации к слову.
+
+	Правила: identity, lower, upper, capitalize, reverse, leet,
+	append:<суффикс>, prepend:<префикс>.
+	"""
+	if rule == 'identity':
+		return word
+	elif rule == 'lower':
+		return word.lower()
+	elif rule == 'upper':
+		return word.upper()
+	elif rule == 'capitalize':
+		return word.capitalize()
+	elif rule == 'reverse':
+		return word[::-1]
+	elif rule == 'leet':
+		return word.lower().translate(_LEET)
+	elif rule.startswith('append:'):
+		return word + rule[len('append:'):]
+	elif rule.startswith('prepend:'):
+		return rule[len('prepend:'):] + word
+	else:
+		raise ValueError(f"Неизвестное правило: {rule}")
+
+
+def _word_bounds(wordlist_path: str) -> np.ndarray:
+	data = np.fromfile(wordlist_path, dtype=np.uint8)
+	newlines = np.flatnonzero(data == ord('\n'))
+	starts = np.concatenate(([0], newlines + 1))
+	ends = np.concatenate((newlines, [len(data)]))
+	if starts[-1] == len(data):
+		starts, ends = starts[:-1], ends[:-1]
+
+	# Окончания строк Windows (\r\n) не входят в слово.
+	has_cr = ends > starts
+	has_cr[has_cr] = data[ends[has_cr] - 1] == ord('\r')
+	ends = ends - has_cr
+
+	return np.stack((starts, ends), axis=1).astype(np.uint64)
+
+
+def _read_words(wordlist_path: str, bounds: np.ndarray) -> list[str]:
+	if len(bounds) == 0:
+		return []
+
+	base = int(bounds[0, 0])
+	with open(wordlist_path, 'rb') as f:
+		f.seek(base)
+		data = f.read(int(bounds[-1, 1]) - base)
+
+	return [
+		data[int(start) - base:int(end) - base].decode('utf-8', errors='replace')
+		for start, end in bounds
+	]
+
+
+def _hash_shard(
+		wordlist_path: str,
+		bounds_path: str,
+		start: int,
+		end: int,
+		rules: list[str],
+		shard_path: str
+) -> str:
+	bounds = np.load(bounds_path, mmap_mode='r')[start:end]
+	words = _read_words(wordlist_path, bounds)
+	candidates = [apply_rule(rule, word).encode('utf-8') for word in words for rule in rules]
+
+	digests = HashFunctions.ma_prime_hash_batch(candidates)
+	ids = np.arange(start * len(rules), end * len(rules), dtype=np.uint64)
+	order = np.argsort(digests, kind='stable')
+
+	np.save(shard_path + '.digests.npy', digests[order])
+	np.save(shard_path + '.ids.npy', ids[order])
+	return shard_path
+
+
+def build_index(
+		wordlist_path: str,
+		index_dir: str,
+		rules: list[str] = DEFAULT_RULES,
+		workers: int = None,
+		words_per_task: int = 20000,
+		partitions: int = 256
+) -> 'PasswordIndex':
+	"""
+	Строит отсортированный индекс ma_prime-хешей словаря с мутациями.
+
+	Словарь делится на участки, которые хешируются в пуле процессов и
+	сохраняются отсортированными. Затем участки сливаются по диапазонам
+	старших битов дайджеста, так что в памяти одновременно находится только
+	один диапазон. Индекс хранит дайджесты (uint32) и номера кандидатов
+	(слово * число правил + правило), сами пароли восстанавливаются при поиске.
+
+	Args:
+		wordlist_path: путь к словарю (по слову в строке, UTF-8)
+		index_dir: каталог индекса
+		rules: правила мутации (см. apply_rule)
+		workers: количество процессов (по умолчанию - число процессоров)
+		words_per_task: количество слов в одной задаче
+		partitions: количество диапазонов дайджестов при слиянии (степень двойки)
+
+	Returns:
+		PasswordIndex: открытый индекс
+	"""
+	if partitions & (partitions - 1) or not 1 <= partitions <= 1 << 16:
+		raise ValueError("Количество диапазонов должно быть степенью двойки не больше 65536")
+	for rule in rules:
+		apply_rule(rule, '')
+
+	os.makedirs(index_dir, exist_ok=True)
+	bounds = _word_bounds(wordlist_path)
+	bounds_path = os.path.join(index_dir, 'word_bounds.npy')
+	np.save(bounds_path, bounds)
+
+	tasks = range(0, len(bounds), words_per_task)
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		shard_paths = list(executor.map(
+			_hash_shard,
+			[wordlist_path] * len(tasks),
+			[bounds_path] * len(tasks),
+			tasks,
+			[min(start + words_per_task, len(bounds)) for start in tasks],
+			[list(rules)] * len(tasks),
+			[os.path.join(index_dir, f'shard_{i:06d}') for i in range(len(tasks))]
+		))
+
+	total = len(bounds) * len(rules)
+	digests_out = np.lib.format.open_memmap(
+		os.path.join(index_dir, 'digests.npy'), mode='w+', dtype=np.uint32, shape=(total,)
+	)
+	ids_out = np.lib.format.open_memmap(
+		os.path.join(index_dir, 'ids.npy'), mode='w+', dtype=np.uint64, shape=(total,)
+	)
+
+	shards = [
+		(np.load(path + '.digests.npy', mmap_mode='r'), np.load(path + '.ids.npy', mmap_mode='r'))
+		for path in shard_paths
+	]
+	edges = np.arange(partitions + 1, dtype=np.uint64) << np.uint64(32 - partitions.bit_length() + 1)
+	shard_edges = [np.searchsorted(digests, edges) for digests, _ in shards]
+
+	position = 0
+	for p in range(partitions):
+		part_digests = np.concatenate(
+			[digests[e[p]:e[p + 1]] for (digests, _), e in zip(shards, shard_edges)] or [np.empty(0, np.uint32)]
+		)
+		part_ids = np.concatenate(
+			[ids[e[p]:e[p + 1]] for (_, ids), e in zip(shards, shard_edges)] or [np.empty(0, np.uint64)]
+		)
+		order = np.argsort(part_digests, kind='stable')
+		digests_out[position:position + len(order)] = part_digests[order]
+		ids_out[position:position + len(order)] = part_ids[order]
+		position += len(order)
+
+	digests_out.flush()
+	ids_out.flush()
+	del shards, digests_out, ids_out
+	for path in shard_paths:
+		os.remove(path + '.digests.npy')
+		os.remove(path + '.ids.npy')
+
+	with open(os.path.join(index_dir, 'metadata.json'), 'w', encoding='utf-8') as f:
+		json.dump({
+			'wordlist': os.path.abspath(wordlist_path),
+			'rules': list(rules),
+			'words': len(bounds),
+			'candidates': total,
+		}, f, indent=4)
+
+	return PasswordIndex(index_dir)
+
+
+class PasswordIndex:
+	"""
+	Поиск паролей по ma_prime-хешу в индексе, построенном build_index.
+
+	Массивы индекса отображаются в память, поиск - двоичный (O(log n)).
+	"""
+	def __init__(self, index_dir: str) -> None:
+		with open(os.path.join(index_dir, 'metadata.json'), 'r', encoding='utf-8') as f:
+			self.metadata = json.load(f)
+
+		self.rules = self.metadata['rules']
+		self.wordlist = self.metadata['wordlist']
+		self.digests = np.load(os.path.join(index_dir, 'digests.npy'), mmap_mode='r')
+		self.ids = np.load(os.path.join(index_dir, 'ids.npy'), mmap_mode='r')
+		self.bounds = np.load(os.path.join(index_dir, 'word_bounds.npy'), mmap_mode='r')
+
+	def __len__(self) -> int:
+		return len(self.digests)
+
+	def candidate(self, candidate_id: int) -> str:
+		word_index, rule_index = divmod(int(candidate_id), len(self.rules))
+		word = _read_words(self.wordlist, self.bounds[word_index:word_index + 1])[0]
+		return apply_rule(self.rules[rule_index], word)
+
+	def lookup(self, digest) -> list[str]:
+		"""
+		Возвращает все кандидаты словаря с заданным хешем.
+
+		Args:
+			digest: хеш как число или шестнадцатеричная строка (вывод hash_password)
+		"""
+		if isinstance(digest, str):
+			digest = int(digest, 16)
+
+		lo = np.searchsorted(self.digests, digest, side='left')
+		hi = np.searchsorted(self.digests, digest, side='right')
+		return list(dict.fromkeys(self.candidate(i) for i in self.ids[lo:hi]))
+
+	def lookup_many(self, digests) -> dict:
+		"""
+		Ищет множество хешей одним векторным двоичным поиском.
+
+		Returns:
+			dict: хеш -> список кандидатов (только найденные хеши)
+		"""
+		values = np.array([int(d, 16) if isinstance(d, str) else d for d in digests], dtype=np.uint32)
+		lo = np.searchsorted(self.digests, values, side='left')
+		hi = np.searchsorted(self.digests, values, side='right')
+
+		return {
+			digest: list(dict.fromkeys(self.candidate(i) for i in self.ids[l:h]))
+			for digest, l, h in zip(digests, lo, hi) if h > l
+		}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Индекс ma_prime-хешей словаря паролей")
+	subparsers = parser.add_subparsers(dest='command', required=True)
+
+	build = subparsers.add_parser('build')
+	build.add_argument('wordlist')
+	build.add_argument('index_dir')
+	build.add_argument('--workers', type=int, default=None)
+	build.add_argument('--words-per-task', type=int, default=20000)
+
+	lookup = subparsers.add_parser('lookup')
+	lookup.add_argument('index_dir')
+	lookup.add_argument('digests', nargs='+')
+
+	args = parser.parse_args()
+	if args.command == 'build':
+		index = build_index(args.wordlist, args.index_dir, workers=args.workers, words_per_task=args.words_per_task)
+		print(f"Кандидатов в индексе: {len(index)}")
+	else:
+		found = PasswordIndex(args.index_dir).lookup_many(args.digests)
+		for digest in args.digests:
+			print(f"{digest}: {', '.join(found.get(digest, [])) or '-'}")
+
+
+if __name__ == "__main__":
+	main()
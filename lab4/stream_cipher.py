@@ -1,13 +1,25 @@
 import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 from typing import Callable
 from generator import Generator
 from hash_functions import HashFunctions
+from keystream_cache import KeystreamCache, default_cache
+from stream_pipeline import StreamPipeline
 import hashlib
+import hmac
+import json
+import mmap
+import numpy as np
+
+JOURNAL_KEY_CHECK_ITERATIONS = 200_000
 
 class StreamCipher:
-	def __init__(self) -> None:
+	def __init__(self, keystream_cache: KeystreamCache = None) -> None:
 		self.generator = Generator()
 		self.hash_func = HashFunctions()
+		self.keystream_cache = default_cache if keystream_cache is None else keystream_cache
 
 	def encrypt_decrypt_file(
 			self,
@@ -15,27 +27,41 @@ class StreamCipher:
 			output_file: str,
 			password: str,
 			hash_algorithm: str = 'ready',
-			generator_type: str = 'yarrow-160'
+			generator_type: str = 'yarrow-160',
+			chunk_size: int = 1 << 20
 	) -> bool:
 		try:
-			with open(input_file, 'rb') as f:
-				data = f.read()
 			key = self._generate_key_from_password(password, hash_algorithm)
-			keystream = self._generate_keystream(len(data), key, generator_type, password)
-			result = bytearray()
-			
-			for i, byte in enumerate(data):
-				result.append(byte ^ keystream[i % len(keystream)])
-
-			with open(output_file, 'wb') as f:
-				f.write(bytes(result))
-			
+			self._encrypt_decrypt_file_with_key(
+				input_file, output_file, password, key, hash_algorithm, generator_type, chunk_size
+			)
 			return True
 		
 		except Exception as e:
 			print(f"Ошибка при обработке файла: {e}")
 			return False
 	
+	def _encrypt_decrypt_file_with_key(
+			self,
+			input_file: str,
+			output_file: str,
+			password: str,
+			key: bytes,
+			hash_algorithm: str,
+			generator_type: str,
+			chunk_size: int,
+			nonce: bytes = b''
+	) -> None:
+		total = os.path.getsize(input_file)
+		keystream = self._keystream_chunks(total, key, generator_type, password, hash_algorithm, chunk_size, nonce)
+
+		with self._output_for(input_file, output_file) as target:
+			with open(input_file, 'rb') as fin, open(target, 'wb') as fout:
+				for keystream_chunk in keystream:
+					chunk = bytearray(fin.read(len(keystream_chunk)))
+					self._xor_into(chunk, keystream_chunk)
+					fout.write(chunk)
+	
 	def _generate_key_from_password(self, password: str, hash_algorithm: str) -> bytes:
 		password_bytes = password.encode('utf-8')
 
@@ -51,39 +77,237 @@ class StreamCipher:
 
 		return hash_result
 	
-	def _generate_keystream(self, length: int, key: bytes, generator_type: str, password: str) -> bytes:
-		seed_data = password.encode() + key
+	def encrypt_decrypt_range(
+			self,
+			input_file: str,
+			output_file: str,
+			password: str,
+			offset: int,
+			length: int,
+			hash_algorithm: str = 'ready',
+			generator_type: str = 'yarrow160'
+	) -> bool:
+		# Генератор переходит к offset через seek. У aes-ctr переход выполняется
+		# за O(1), у bbs - за O(log offset), и время обработки пропорционально
+		# длине диапазона. У yarrow160 (по умолчанию) и остальных генераторов
+		# переход сравним по стоимости с выработкой offset байт потока.
+		try:
+			with open(input_file, 'rb') as f:
+				f.seek(offset)
+				data = f.read(length)
+			
+			if not data:
+				open(output_file, 'wb').close()
+				return True
+			
+			key = self._generate_key_from_password(password, hash_algorithm)
+			generator = self._create_keystream_generator(key, generator_type, password)
+			generator.seek(offset)
+			keystream = generator.generate_bytes(len(data))
+
+			result = bytearray(data)
+			self._xor_into(result, keystream)
+			with open(output_file, 'wb') as f:
+				f.write(result)
+			
+			return True
+		
+		except Exception as e:
+			print(f"Ошибка при обработке файла: {e}")
+			return False
+	
+	def encrypt_decrypt_file_pipelined(
+			self,
+			input_file: str,
+			output_file: str,
+			password: str,
+			hash_algorithm: str = 'ready',
+			generator_type: str = 'yarrow160',
+			chunk_size: int = 1 << 20,
+			depth: int = 2
+	) -> bool:
+		try:
+			key = self._generate_key_from_password(password, hash_algorithm)
+			total = os.path.getsize(input_file)
+			keystream = self._keystream_chunks(total, key, generator_type, password, hash_algorithm, chunk_size)
+
+			with self._output_for(input_file, output_file) as target:
+				with open(input_file, 'rb') as fin, open(target, 'wb') as fout:
+					chunks = iter(lambda: fin.read(chunk_size), b'')
+					StreamPipeline(depth).run(chunks, keystream, fout.write, self._xor_into)
+			
+			return True
+		
+		except Exception as e:
+			print(f"Ошибка при обработке файла: {e}")
+			return False
+	
+	def encrypt_decrypt_in_place(
+			self,
+			file_path: str,
+			password: str,
+			hash_algorithm: str = 'ready',
+			generator_type: str = 'yarrow160',
+			chunk_size: int = 16 << 20,
+			journal_path: str = None
+	) -> bool:
+		# Файл отображается в память и обрабатывается по фрагментам. Перед
+		# изменением фрагмента его исходные байты записываются в журнал отката,
+		# после записи фрагмента в журнал заносится обработанная позиция.
+		# Прерванный запуск продолжается с последнего завершённого фрагмента,
+		# недописанный фрагмент предварительно восстанавливается из журнала.
+		journal_path = journal_path or file_path + '.journal'
+		undo_path = journal_path + '.undo'
+
+		try:
+			key = self._generate_key_from_password(password, hash_algorithm)
+			generator = self._create_reproducible_generator(key, generator_type, password)
+			file_size = os.path.getsize(file_path)
+			journal = {
+				'file_size': file_size,
+				'chunk_size': chunk_size,
+				'hash_algorithm': hash_algorithm,
+				'generator_type': generator_type,
+				'committed': 0,
+			}
+
+			if os.path.exists(journal_path):
+				with open(journal_path, 'r', encoding='utf-8') as f:
+					saved = json.load(f)
+				if any(saved.get(name) != value for name, value in journal.items() if name != 'committed'):
+					raise ValueError("Журнал относится к другому файлу или параметрам")
+				key_check = self._journal_key_check(password, key, bytes.fromhex(saved['salt']))
+				if not hmac.compare_digest(key_check, saved['key_check']):
+					raise ValueError("Журнал создан с другим паролем")
+				journal = saved
+			else:
+				salt = os.urandom(16)
+				journal['salt'] = salt.hex()
+				journal['key_check'] = self._journal_key_check(password, key, salt)
+
+			if file_size == 0:
+				return True
+
+			generator.seek(journal['committed'])
+
+			with open(file_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+				if os.path.exists(undo_path):
+					with open(undo_path, 'rb') as undo:
+						offset = int.from_bytes(undo.read(8), 'big')
+						original = undo.read()
+					if offset == journal['committed']:
+						mm[offset:offset + len(original)] = original
+						mm.flush()
+
+				for offset in range(journal['committed'], file_size, chunk_size):
+					length = min(chunk_size, file_size - offset)
+					self._write_durable(undo_path, offset.to_bytes(8, 'big') + mm[offset:offset + length])
+
+					with memoryview(mm)[offset:offset + length] as view:
+						self._xor_into(view, generator.generate_bytes(length))
+					mm.flush()
+
+					journal['committed'] = offset + length
+					self._write_durable(journal_path, json.dumps(journal).encode('utf-8'))
+
+			os.remove(journal_path)
+			os.remove(undo_path)
+			return True
+		
+		except Exception as e:
+			print(f"Ошибка при обработке файла: {e}")
+			return False
+	
+	@staticmethod
+	@contextmanager
+	def _output_for(input_file: str, output_file: str):
+		# Файлы обрабатываются по фрагментам, поэтому при совпадении входного
+		# и выходного файла открытие выходного на запись стёрло бы входной до
+		# чтения. В этом случае результат пишется во временный файл рядом и
+		# заменяет исходный только после успешной обработки.
+		if not (os.path.exists(output_file) and os.path.samefile(input_file, output_file)):
+			yield output_file
+			return
+
+		output_file = os.path.realpath(output_file)
+		fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_file))
+		os.close(fd)
+		try:
+			shutil.copymode(output_file, temp_path)
+			yield temp_path
+			os.replace(temp_path, output_file)
+		finally:
+			if os.path.exists(temp_path):
+				os.remove(temp_path)
+	
+	@staticmethod
+	def _journal_key_check(password: str, key: bytes, salt: bytes) -> str:
+		# Журнал лежит рядом с файлом в открытом виде, поэтому проверочное
+		# значение пароля солится и вычисляется медленно (PBKDF2), чтобы
+		# перебор паролей по журналу был дорогим.
+		return hashlib.pbkdf2_hmac('sha256', password.encode() + key, salt, JOURNAL_KEY_CHECK_ITERATIONS).hex()
+	
+	@staticmethod
+	def _write_durable(path: str, data: bytes) -> None:
+		temp_path = path + '.tmp'
+		with open(temp_path, 'wb') as f:
+			f.write(data)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(temp_path, path)
+	
+	@staticmethod
+	def _xor_into(buffer, keystream: bytes) -> None:
+		# XOR на месте через представления numpy без поэлементных объектов Python:
+		# buffer - изменяемый буфер (bytearray, memoryview, mmap), keystream не короче его.
+		target = np.frombuffer(buffer, dtype=np.uint8)
+		np.bitwise_xor(target, np.frombuffer(keystream, dtype=np.uint8, count=len(target)), out=target)
+
+	def _create_keystream_generator(self, key: bytes, generator_type: str, password: str, nonce: bytes = b''):
+		# nonce различает ключевые потоки разных файлов, зашифрованных одним паролем.
+		seed_data = password.encode() + key + nonce
 		seed_int = int.from_bytes(hashlib.sha256(seed_data).digest()[:4], 'big')
 		seed_bytes = hashlib.sha256(seed_data).digest()
 
-		needed_bits = int(length * 8 * 1.1)
-
 		if generator_type == 'quadratic':
-			bits = self.generator.quadratic_congruential_generator(needed_bits, seed_int)
+			return self.generator.QuadraticCongruential(seed_int)
 		elif generator_type == 'bbs':
-			bits = self.generator.bbs_generator(needed_bits, seed_int)
+			return self.generator.BlumBlumShub(seed_int, prime_seed=seed_bytes)
 		elif generator_type == 'yarrow160':
-			bits = self.generator.yarrow160_generator(needed_bits, seed_bytes)
+			return self.generator.Yarrow160(seed_bytes)
+		elif generator_type == 'aes-ctr':
+			return self.generator.AESCounter(seed_bytes)
+		elif generator_type == 'lfsr':
+			return self.generator.LFSR(seed_bytes)
+		elif generator_type == 'geffe':
+			return self.generator.Geffe(seed_bytes)
+		elif generator_type == 'shrinking':
+			return self.generator.Shrinking(seed_bytes)
 		else:
 			raise ValueError(f"Неизвестный тип генератора: {generator_type}")
 
-		keystream = self._bits_to_bytes(bits)
-
-		return keystream[:length]
+	def _create_reproducible_generator(self, key: bytes, generator_type: str, password: str):
+		# Режимы, которые продолжают работу позже или расшифровываются по частям,
+		# заново создают генератор из пароля и должны получить тот же поток.
+		generator = self._create_keystream_generator(key, generator_type, password)
+		if self._create_keystream_generator(key, generator_type, password).get_state() != generator.get_state():
+			raise ValueError(f"Генератор {generator_type} не воспроизводит ключевой поток по паролю")
+		return generator
 	
-	def _bits_to_bytes(self, bits: list) -> bytes:
-		bytes_list = []
-
-		num_bytes = len(bits) // 8
-
-		for i in range(num_bytes):
-			byte = 0
-			for j in range(8):
-				if i + j < len(bits):
-					byte = (byte << 1) | bits[i * 8 + j]
-			bytes_list.append(byte)
-		
-		return bytes(bytes_list)
+	def _keystream_chunks(
+			self,
+			total: int,
+			key: bytes,
+			generator_type: str,
+			password: str,
+			hash_algorithm: str,
+			chunk_size: int,
+			nonce: bytes = b''
+	):
+		cache_key = self.keystream_cache.make_key(password.encode() + key + nonce, hash_algorithm, generator_type)
+		return self.keystream_cache.iter_chunks(
+			cache_key, total, lambda: self._create_keystream_generator(key, generator_type, password, nonce), chunk_size
+		)
 	
 	def hash_password(self, password: str, hash_algorithm: str) -> str:
 		password_bytes = password.encode('utf-8')
@@ -99,3 +323,24 @@ class StreamCipher:
 			return hash_result.hex()
 		
 		raise ValueError(f"Неизвестный алгоритм хеширования: {hash_algorithm}")
+
+	def hash_passwords(self, passwords: list[str], hash_algorithm: str) -> list[str]:
+		passwords_bytes = [password.encode('utf-8') for password in passwords]
+
+		if hash_algorithm == 'ready':
+			return [self.hash_func.ready_hash(password, 'sha256').hex() for password in passwords_bytes]
+		if hash_algorithm == 'ma_prime':
+			return [f"{hash_int:08x}" for hash_int in self.hash_func.ma_prime_hash_batch(passwords_bytes)]
+		if hash_algorithm == 'gost':
+			by_length = {}
+			for i, password in enumerate(passwords_bytes):
+				by_length.setdefault(len(password), []).append(i)
+
+			result = [None] * len(passwords_bytes)
+			for indices in by_length.values():
+				digests = self.hash_func.gost_341194_hash_batch([passwords_bytes[i] for i in indices])
+				for i, digest in zip(indices, digests):
+					result[i] = digest.tobytes().hex()
+			return result
+
+		raise ValueError(f"Неизвестный алгоритм хеширования: {hash_algorithm}")
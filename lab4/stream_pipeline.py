@@ -0,0 +1,139 @@
+import queue
+import threading
+from typing import Callable, Iterable
+
+
+_DONE = object()
+
+
+class _Stopped(Exception):
+	pass
+
+
+class StreamPipeline:
+	"""
+	Конвейер потокового шифрования с перекрытием ввода-вывода и вычислений.
+
+	Чтение, выработка ключевого потока, наложение гаммы и запись выполняются
+	в отдельных потоках, связанных очередями ограниченной длины depth
+	(depth = 2 - двойная буферизация). Пока один фрагмент шифруется,
+	следующий читается, а предыдущий записывается. Файловый ввод-вывод,
+	hashlib, pycryptodome и numpy освобождают GIL, поэтому стадии
+	действительно выполняются параллельно.
+
+	Ошибка в любой стадии останавливает конвейер и повторно возбуждается в run.
+	"""
+	def __init__(self, depth: int = 2) -> None:
+		if depth < 1:
+			raise ValueError("Глубина очереди должна быть положительной")
+		self.depth = depth
+
+	def run(
+			self,
+			chunks: Iterable[bytes],
+			keystream: Iterable[bytes],
+			write: Callable[[bytes], None],
+			combine: Callable[[bytearray, bytes], None],
+			observers: Iterable[Callable[[bytes, bytes], None]] = ()
+	) -> int:
+		"""
+		Пропускает данные через конвейер.
+
+		Args:
+			chunks: источник фрагментов входных данных
+			keystream: источник фрагментов ключевого потока той же длины
+			write: приёмник обработанных фрагментов
+			combine: наложение ключевого потока на изменяемый буфер на месте
+			observers: функции, получающие пару (входной фрагмент, выходной фрагмент)
+
+		Returns:
+			int: количество обработанных байтов
+		"""
+		self._stop = threading.Event()
+		self._errors = []
+		read_queue = queue.Queue(self.depth)
+		keystream_queue = queue.Queue(self.depth)
+		write_queue = queue.Queue(self.depth)
+
+		stages = [
+			threading.Thread(target=self._produce, args=(chunks, read_queue), name='pipeline-read'),
+			threading.Thread(target=self._produce, args=(keystream, keystream_queue), name='pipeline-keystream'),
+			threading.Thread(target=self._consume, args=(write_queue, write), name='pipeline-write'),
+		]
+		for stage in stages:
+			stage.start()
+
+		total = 0
+		try:
+			while True:
+				chunk = self._get(read_queue)
+				if chunk is _DONE:
+					break
+				keystream_chunk = self._get(keystream_queue)
+				if keystream_chunk is _DONE:
+					raise ValueError("Ключевой поток короче входных данных")
+
+				result = bytearray(chunk)
+				combine(result, keystream_chunk)
+				for observer in observers:
+					observer(chunk, result)
+				self._put(write_queue, result)
+				total += len(result)
+
+			self._put(write_queue, _DONE)
+			stages[-1].join()
+		except Exception as e:
+			self._errors.append(e)
+		finally:
+			# Остановка освобождает стадии, ожидающие места в очереди, например
+			# генератор ключевого потока, выработавший лишний фрагмент.
+			self._stop.set()
+			for stage in stages:
+				stage.join()
+
+		if self._errors:
+			raise self._errors[0]
+
+		return total
+
+	def _put(self, target: queue.Queue, item) -> None:
+		while not self._stop.is_set():
+			try:
+				target.put(item, timeout=0.1)
+				return
+			except queue.Full:
+				pass
+		raise _Stopped
+
+	def _get(self, source: queue.Queue):
+		while not self._stop.is_set():
+			try:
+				return source.get(timeout=0.1)
+			except queue.Empty:
+				pass
+		raise _Stopped
+
+	def _produce(self, iterable: Iterable[bytes], target: queue.Queue) -> None:
+		try:
+			for item in iterable:
+				self._put(target, item)
+			self._put(target, _DONE)
+		except _Stopped:
+			pass
+		except Exception as e:
+			self._errors.append(e)
+			self._stop.set()
+
+	def _consume(self, source: queue.Queue, write: Callable[[bytes], None]) -> None:
+		try:
+			while True:
+				item = self._get(source)
+				if item is _DONE:
+					return
+				write(item)
+		except _Stopped:
+			pass
+		except Exception as e:
+			self._errors.append(e)
+			self._stop.set()
+
@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from hash_functions import HashFunctions
+
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+# Алгоритмы hashlib освобождают GIL при хешировании больших буферов,
+# поэтому для них достаточно пула потоков.
+THREADED_ALGORITHMS = ('md5', 'sha1', 'sha256')
+
+
+def _hash_leaf(chunk: bytes, algorithm: str) -> bytes:
+	hasher = HashFunctions.new(algorithm, LEAF_PREFIX)
+	hasher.update(chunk)
+	return hasher.digest()
+
+
+def _hash_node(left: bytes, right: bytes, algorithm: str) -> bytes:
+	return HashFunctions.new(algorithm, NODE_PREFIX + left + right).digest()
+
+
+def _hash_file_chunk(path: str, offset: int, size: int, algorithm: str) -> bytes:
+	with open(path, 'rb') as f:
+		f.seek(offset)
+		return _hash_leaf(f.read(size), algorithm)
+
+
+class MerkleTree:
+	"""
+	Дерево Меркла над хешами фрагментов файла.
+
+	Лист - хеш 0x00 || фрагмент, внутренний узел - хеш 0x01 || левый || правый.
+	Узел без пары переносится на следующий уровень без изменений. Префиксы
+	не дают выдать внутренний узел за лист.
+	"""
+	def __init__(self, leaves: list[bytes], algorithm: str = 'sha256', chunk_size: int = None) -> None:
+		"""
+		Args:
+			leaves: хеши листьев по порядку фрагментов
+			algorithm: алгоритм хеширования (см. HashFunctions.new)
+			chunk_size: размер фрагмента в байтах (если дерево построено по файлу)
+		"""
+		self.algorithm = algorithm
+		self.chunk_size = chunk_size
+		self.levels = [list(leaves) or [_hash_leaf(b'', algorithm)]]
+
+		while len(self.levels[-1]) > 1:
+			level = self.levels[-1]
+			parents = [
+				_hash_node(level[i], level[i + 1], algorithm) for i in range(0, len(level) - 1, 2)
+			]
+			if len(level) % 2:
+				parents.append(level[-1])
+			self.levels.append(parents)
+
+	@property
+	def root(self) -> bytes:
+		return self.levels[-1][0]
+
+	def hexroot(self) -> str:
+		return self.root.hex()
+
+	@property
+	def leaves(self) -> list[bytes]:
+		return self.levels[0]
+
+	def proof(self, index: int) -> list[tuple[bytes, bool]]:
+		"""
+		Возвращает путь проверки фрагмента с номером index.
+
+		Returns:
+			list[tuple[bytes, bool]]: хеши соседних узлов снизу вверх и признак,
+			что сосед находится слева
+		"""
+		if not 0 <= index < len(self.leaves):
+			raise ValueError(f"Нет фрагмента с номером {index}")
+
+		path = []
+		for level in self.levels[:-1]:
+			sibling = index ^ 1
+			if sibling < len(level):
+				path.append((level[sibling], sibling < index))
+			index //= 2
+
+		return path
+
+	@staticmethod
+	def verify_chunk(
+			chunk: bytes,
+			proof: list[tuple[bytes, bool]],
+			root: bytes,
+			algorithm: str = 'sha256'
+	) -> bool:
+		"""
+		Проверяет фрагмент по пути проверки и корню дерева.
+		"""
+		node = _hash_leaf(chunk, algorithm)
+		for sibling, is_left in proof:
+			node = _hash_node(sibling, node, algorithm) if is_left else _hash_node(node, sibling, algorithm)
+
+		return node == root
+
+	def verify_file_chunk(self, path: str, index: int) -> bool:
+		"""
+		Перечитывает фрагмент файла и проверяет его по корню дерева.
+		"""
+		if self.chunk_size is None:
+			raise ValueError("Размер фрагмента неизвестен")
+
+		with open(path, 'rb') as f:
+			f.seek(index * self.chunk_size)
+			chunk = f.read(self.chunk_size)
+
+		return self.verify_chunk(chunk, self.proof(index), self.root, self.algorithm)
+
+
+def tree_hash_file(
+		path: str,
+		algorithm: str = 'sha256',
+		chunk_size: int = 1 << 20,
+		workers: int = None
+) -> MerkleTree:
+	"""
+	Строит дерево Меркла по файлу, хешируя фрагменты параллельно.
+
+	Для алгоритмов hashlib используется пул потоков, для ma_prime и ГОСТ -
+	пул процессов. Каждая задача сама читает свой фрагмент, поэтому данные
+	файла не передаются между процессами.
+
+	Args:
+		path: путь к файлу
+		algorithm: 'ma_prime', 'gost', 'md5', 'sha1' или 'sha256'
+		chunk_size: размер фрагмента в байтах
+		workers: количество потоков или процессов (по умолчанию - число процессоров)
+
+	Returns:
+		MerkleTree: дерево, корень которого служит дайджестом файла
+	"""
+	if chunk_size <= 0:
+		raise ValueError("Размер фрагмента должен быть положительным")
+	HashFunctions.new(algorithm)
+
+	size = os.path.getsize(path)
+	offsets = range(0, size, chunk_size)
+	executor_cls = ThreadPoolExecutor if algorithm in THREADED_ALGORITHMS else ProcessPoolExecutor
+
+	if len(offsets) <= 1:
+		leaves = [_hash_file_chunk(path, offset, chunk_size, algorithm) for offset in offsets]
+	else:
+		with executor_cls(max_workers=workers) as executor:
+			leaves = list(executor.map(
+				_hash_file_chunk,
+				[path] * len(offsets),
+				offsets,
+				[chunk_size] * len(offsets),
+				[algorithm] * len(offsets)
+			))
+
+	return MerkleTree(leaves, algorithm, chunk_size)